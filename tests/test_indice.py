@@ -0,0 +1,56 @@
+import os
+import random
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "usr", "share", "tetris", "tetris"))
+
+from nucleo import Jogo, Indice, colisao, COLS, LINHAS, LIXO, ESQUERDA, DIREITA, BAIXO, GIRAR, GRAVIDADE, QUEDA
+
+# Queda rara e muito movimento lateral: as peças deslizam sob saliências e deixam buracos
+ACOES = [ESQUERDA, DIREITA, BAIXO, GIRAR, GRAVIDADE, GRAVIDADE, GRAVIDADE] * 3 + [QUEDA]
+
+def grid_quase_cheio(rng):
+    # Metade de baixo com uma célula vazia por linha: as peças completam linhas
+    grid = [[0] * COLS for _ in range(LINHAS // 2)]
+    for _ in range(LINHAS - LINHAS // 2):
+        linha = [LIXO] * COLS
+        linha[rng.randrange(COLS)] = 0
+        grid.append(linha)
+    return grid
+
+def conferir_indice(jogo):
+    novo = Indice(jogo.grid)
+    assert jogo.indice.preenchidas == novo.preenchidas
+    assert jogo.indice.alturas == novo.alturas
+    assert jogo.indice.buracos == novo.buracos
+
+def queda_por_colisao(jogo):
+    distancia = 0
+    while not colisao(jogo.peca, jogo.grid, dy=distancia + 1):
+        distancia += 1
+    return distancia
+
+def test_indice_e_queda_em_partidas_aleatorias():
+    removidas = 0
+    for seed in range(10):
+        jogo = Jogo(random.Random(seed))
+        acoes = random.Random(seed + 1000)
+        jogo.grid = grid_quase_cheio(acoes)
+        for _ in range(2000):
+            removidas += jogo.step(acoes.choice(ACOES))
+            if jogo.game_over:
+                jogo.reiniciar()
+                jogo.grid = grid_quase_cheio(acoes)
+            conferir_indice(jogo)
+            assert jogo.distancia_queda() == queda_por_colisao(jogo)
+    assert removidas > 0
+
+def test_indice_com_lixo_transbordando():
+    rng = random.Random(7)
+    for linhas in (1, 2, 4, LINHAS):
+        jogo = Jogo(random.Random(linhas))
+        jogo.grid = grid_quase_cheio(rng)
+        while not jogo.game_over:
+            jogo.adicionar_lixo(linhas, rng.randrange(COLS))
+            conferir_indice(jogo)
+        assert max(jogo.indice.alturas) <= LINHAS
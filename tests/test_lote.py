@@ -0,0 +1,57 @@
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "usr", "share", "tetris", "tetris"))
+
+np = pytest.importorskip("numpy")
+
+import lote
+from nucleo import Jogo, COLS, LINHAS, CORES, NADA, GRAVIDADE, QUEDA
+
+class Fila:
+    # rng do Jogo que devolve as peças (tipo, cor) sorteadas pelo lote
+    def __init__(self, indices):
+        self.indices = list(indices)
+
+    def choice(self, seq):
+        return seq[self.indices.pop(0)]
+
+def test_lote_igual_ao_jogo():
+    n = 50
+    tabuleiros = lote.Lote(n, seed=7)
+    filas = [Fila([tabuleiros.tipo[i], tabuleiros.cor[i], tabuleiros.proximo_tipo[i], tabuleiros.proxima_cor[i]])
+             for i in range(n)]
+    jogos = [Jogo(fila) for fila in filas]
+
+    # Metade de baixo quase cheia (uma célula vazia por linha) para forçar linhas removidas
+    rng = np.random.default_rng(3)
+    for i in range(n):
+        grid = rng.integers(1, len(CORES) + 1, size=(LINHAS, COLS))
+        grid[:LINHAS // 2] = 0
+        for y in range(LINHAS // 2, LINHAS):
+            grid[y, rng.integers(COLS)] = 0
+        tabuleiros.grids[i] = grid
+        jogos[i].grid = grid.tolist()
+
+    removidas_total = 0
+    for _ in range(600):
+        acoes = rng.integers(NADA, QUEDA + 1, size=n)
+        acoes[::2] = np.where(rng.random(n // 2) < 0.5, GRAVIDADE, acoes[::2])
+        removidas = tabuleiros.step(acoes)
+        for i, jogo in enumerate(jogos):
+            if jogo.game_over:
+                continue
+            # Se o lote travou, a próxima peça já foi sorteada: o Jogo a recebe pela fila
+            filas[i].indices += [tabuleiros.proximo_tipo[i], tabuleiros.proxima_cor[i]]
+            assert jogo.step(int(acoes[i])) == removidas[i]
+            if jogo.fixada is None:
+                del filas[i].indices[-2:]
+            assert (np.array(jogo.grid) == tabuleiros.grids[i]).all()
+            assert jogo.pontuacao == tabuleiros.pontuacao[i]
+            assert jogo.nivel == tabuleiros.nivel[i]
+            assert jogo.game_over == tabuleiros.game_over[i]
+            assert (jogo.peca.x, jogo.peca.y) == (tabuleiros.x[i], tabuleiros.y[i])
+        removidas_total += int(removidas.sum())
+    assert removidas_total > 0
@@ -0,0 +1,61 @@
+import os
+import random
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "usr", "share", "tetris", "tetris"))
+
+import replay
+from nucleo import Jogo, ESQUERDA, DIREITA, GIRAR, GRAVIDADE, QUEDA
+
+# Intervalos cujo varint começa com 0xFF (= FIM) e os limites de 1, 2 e 3 bytes
+DELTAS = [0, 127, 128, 255, 383, 511, 16383, 16384]
+
+class Relogio:
+    def __init__(self):
+        self.agora = 0.0
+
+    def __call__(self):
+        return self.agora
+
+def test_ida_e_volta(tmp_path, monkeypatch):
+    relogio = Relogio()
+    monkeypatch.setattr(replay.time, "perf_counter", relogio)
+    caminho = tmp_path / "partida.ttr"
+    seed = 42
+    jogo = Jogo(random.Random(seed))
+    gravador = replay.Gravador(jogo, caminho, seed)
+    acoes = [ESQUERDA, GIRAR, DIREITA, GRAVIDADE, QUEDA] * 8
+    esperados = []
+    for i, acao in enumerate(acoes):
+        delta = DELTAS[i % len(DELTAS)]
+        # + 1 µs: o gravador trunca para ms, e 0.511 em float é 0.51099...
+        relogio.agora += delta / 1000 + 1e-6
+        jogo.step(acao)
+        esperados.append((delta, acao))
+    gravador.fechar()
+
+    lido_seed, eventos, final = replay.ler(caminho)
+    assert lido_seed == seed
+    assert eventos == esperados
+    assert final == replay.estado_final(jogo)
+    confere, _ = replay.reproduzir(caminho)
+    assert confere
+
+def test_gravacao_interrompida(tmp_path, monkeypatch):
+    relogio = Relogio()
+    monkeypatch.setattr(replay.time, "perf_counter", relogio)
+    caminho = tmp_path / "partida.ttr"
+    jogo = Jogo(random.Random(1))
+    gravador = replay.Gravador(jogo, caminho, 1)
+    relogio.agora = 0.511 + 1e-6
+    jogo.step(GRAVIDADE)
+    relogio.agora += 16.384
+    jogo.step(QUEDA)
+    gravador.arquivo.close()
+    # Corta o último varint no meio
+    dados = caminho.read_bytes()
+    caminho.write_bytes(dados[:-1])
+
+    _, eventos, final = replay.ler(caminho)
+    assert eventos == [(511, GRAVIDADE)]
+    assert final is None
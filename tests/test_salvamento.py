@@ -0,0 +1,111 @@
+import json
+import os
+import random
+import sys
+import threading
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "usr", "share", "tetris", "tetris"))
+
+import salvamento
+from nucleo import Jogo, COLS, LINHAS, LIXO, ESQUERDA, DIREITA, GIRAR, GRAVIDADE, QUEDA
+
+ACOES = [ESQUERDA, DIREITA, GIRAR, GRAVIDADE, GRAVIDADE, QUEDA]
+
+def jogo_em_andamento(seed=3):
+    jogo = Jogo(random.Random(seed))
+    acoes = random.Random(seed)
+    for _ in range(60):
+        jogo.step(acoes.choice(ACOES))
+    # Lixo usa o maior valor de célula que cabe nos 3 bits
+    jogo.adicionar_lixo(2, 4)
+    assert not jogo.game_over
+    return jogo
+
+def gravar_save(caminho, jogo):
+    salvamento.gravar(str(caminho), salvamento.serializar(jogo.exportar()))
+
+def test_ida_e_volta(tmp_path):
+    jogo = jogo_em_andamento()
+    caminho = tmp_path / "savegame.sav"
+    gravar_save(caminho, jogo)
+
+    dados = salvamento.carregar(str(caminho))
+    esperado = jogo.exportar()
+    assert dados["grid"] == esperado["grid"]
+    assert any(LIXO in linha for linha in dados["grid"])
+    assert dados["peca"] == esperado["peca"]
+    for chave in ("score", "level", "lines", "next_peca", "next_cor"):
+        assert dados[chave] == esperado[chave]
+    assert dados["rng"] == esperado["rng"]
+
+    # Com o rng restaurado, a partida continua igual à original
+    copia = Jogo(random.Random())
+    copia.carregar(dados)
+    for acao in [QUEDA] * 30:
+        jogo.step(acao)
+        copia.step(acao)
+        assert copia.exportar() == jogo.exportar()
+
+def test_save_corrompido_ou_cortado(tmp_path):
+    caminho = tmp_path / "savegame.sav"
+    gravar_save(caminho, jogo_em_andamento())
+    conteudo = caminho.read_bytes()
+
+    corrompido = bytearray(conteudo)
+    corrompido[len(corrompido) // 2] ^= 0x10
+    for ruim in (bytes(corrompido), conteudo[:-1], conteudo[:len(conteudo) // 2], conteudo[:3], b""):
+        caminho.write_bytes(ruim)
+        assert salvamento.carregar(str(caminho)) is None
+
+def test_save_legado(tmp_path):
+    jogo = jogo_em_andamento()
+    legado = tmp_path / "savegame.json"
+    # Formato antigo: sem peça atual, cor da próxima nem rng
+    antigo = {chave: jogo.exportar()[chave] for chave in ("grid", "score", "level", "lines", "next_peca")}
+    legado.write_text(json.dumps(antigo))
+
+    ausente = str(tmp_path / "savegame.sav")
+    assert salvamento.carregar(ausente, str(legado)) == antigo
+    copia = Jogo(random.Random())
+    copia.carregar(salvamento.carregar(ausente, str(legado)))
+    assert copia.grid == jogo.grid
+
+    # O save binário, quando válido, tem preferência
+    binario = tmp_path / "novo.sav"
+    jogo.step(QUEDA)
+    gravar_save(binario, jogo)
+    dados = salvamento.carregar(str(binario), str(legado))
+    assert "peca" in dados and dados["grid"] == jogo.grid
+
+    # O legado não guarda o tamanho: outro tabuleiro é ignorado
+    antigo["grid"] = [[0] * (COLS + 1) for _ in range(LINHAS)]
+    legado.write_text(json.dumps(antigo))
+    assert salvamento.carregar(ausente, str(legado)) is None
+    legado.write_text("{")
+    assert salvamento.carregar(ausente, str(legado)) is None
+
+def test_cancelar_antes_de_apagar(tmp_path, monkeypatch):
+    # Uma escrita lenta em andamento não pode recriar o save depois de apagado
+    gravar = salvamento.gravar
+    comecou = threading.Event()
+
+    def gravar_devagar(caminho, conteudo):
+        comecou.set()
+        time.sleep(0.2)
+        gravar(caminho, conteudo)
+
+    monkeypatch.setattr(salvamento, "gravar", gravar_devagar)
+    caminho = str(tmp_path / "savegame.sav")
+    autosave = salvamento.Autosave(caminho)
+    jogo = jogo_em_andamento()
+    autosave.agendar(jogo)
+    assert comecou.wait(5)
+    jogo.step(QUEDA)
+    autosave.agendar(jogo)  # fica pendente atrás da escrita lenta
+
+    autosave.cancelar()
+    salvamento.apagar(caminho)
+    autosave.fechar()
+    assert not os.path.exists(caminho)
+    assert not os.path.exists(caminho + ".tmp")
@@ -0,0 +1,409 @@
+import json
+import os
+import platform
+import random
+import statistics
+import sys
+import tempfile
+import time
+
+import nucleo
+from nucleo import COLS, LINHAS, FORMAS, Peca, Indice, Jogo, ESQUERDA, DIREITA
+
+# --- SUÍTE DE BENCHMARKS (HEADLESS) ---
+# Três grupos, todos determinísticos (seeds fixos) e sem janela (driver de vídeo
+# "dummy" do SDL):
+#   motor  colisao, rotacionar, remover_linhas (varredura e índice) e
+#          distancia_queda em tabuleiros roteirizados com vários preenchimentos
+#   render quadro inteiro (composição das camadas), quadro parcial (peça mexeu),
+#          reconstrução das camadas e desenhar_tabuleiro / desenhar_bloco_cube /
+#          desenhar_texto em várias resoluções e preenchimentos
+#   ponta  uma partida do bot com seed fixo gravada em .ttr e reproduzida sem
+#          tela (só o motor) e com tela (motor + desenho de cada step)
+#
+# Cada caso é calibrado para que um lote dure pelo menos --tempo segundos; o
+# resultado é a mediana de --repeticoes lotes, em microssegundos por operação.
+#
+#   python benchmark.py [--so motor,render] [--saida resultados.json]
+#   python benchmark.py --base base.json [--limite 0.15]   compara e sai com 1
+#                                                          se algo piorou além do limite
+#   python benchmark.py --gravar-base base.json            grava a base de referência
+#
+# A base só faz sentido na mesma máquina e no mesmo tamanho de tabuleiro
+# (TETRIS_TABULEIRO): tamanhos diferentes são recusados.
+
+FORMATO = 1
+SEED = 20240607
+PREENCHIMENTOS = [0.0, 0.5, 0.85]
+RESOLUCOES = [(800, 600), (1280, 720), (1920, 1080)]
+PECAS_PONTA = 300
+LIMITE = 0.15
+GRUPOS = ["motor", "render", "ponta"]
+
+# A saída do benchmark é lida por scripts: sem a mensagem do pygame no stdout
+os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")
+
+def medir(rodar, repeticoes, tempo_minimo):
+    # rodar(n) executa n operações e devolve os segundos gastos só nelas
+    n = 1
+    while rodar(n) < tempo_minimo and n < 1 << 24:
+        n *= 2
+    amostras = [rodar(n) / n * 1e6 for _ in range(repeticoes)]
+    return {"us": statistics.median(amostras), "min_us": min(amostras), "n": n}
+
+def tabuleiro_roteirizado(preenchimento, rng, cheias=0):
+    # As linhas de baixo (preenchimento * LINHAS) com 70% das células ocupadas e
+    # pelo menos um buraco cada; as cheias últimas linhas ficam completas
+    grid = nucleo.criar_grid()
+    ocupadas = round(preenchimento * LINHAS)
+    for i in range(LINHAS - ocupadas, LINHAS):
+        linha = grid[i]
+        for j in range(COLS):
+            if rng.random() < 0.7:
+                linha[j] = rng.randint(1, len(nucleo.CORES))
+        linha[rng.randrange(COLS)] = 0
+    for i in range(LINHAS - cheias, LINHAS):
+        grid[i] = [rng.randint(1, len(nucleo.CORES)) for _ in range(COLS)]
+    return grid
+
+def _nome_preenchimento(preenchimento):
+    return f"{round(preenchimento * 100)}%"
+
+# --- MOTOR ---
+def _motor(medir_caso):
+    resultados = {}
+    for preenchimento in PREENCHIMENTOS:
+        rng = random.Random(SEED)
+        sufixo = _nome_preenchimento(preenchimento)
+        grid = tabuleiro_roteirizado(preenchimento, rng)
+        indice = Indice(grid)
+
+        sondas = []
+        for _ in range(1000):
+            forma = rng.choice(FORMAS)
+            for _ in range(rng.randrange(4)):
+                forma = nucleo.rotacionar_forma(forma)
+            x = rng.randint(-1, COLS - len(forma[0]) + 1)
+            y = rng.randint(0, LINHAS - len(forma))
+            sondas.append(Peca(x, y, forma, rng))
+
+        def colisao(n, sondas=sondas, grid=grid):
+            teste = nucleo.colisao
+            inicio = time.perf_counter()
+            for k in range(n):
+                teste(sondas[k % 1000], grid)
+            return time.perf_counter() - inicio
+
+        # Peças no topo, em todas as colunas em que cabem
+        quedas = [Peca(x, 0, forma, rng) for forma in FORMAS for x in range(COLS - len(forma[0]) + 1)]
+
+        def distancia_queda(n, quedas=quedas, grid=grid, indice=indice):
+            distancia = nucleo.distancia_queda
+            inicio = time.perf_counter()
+            for k in range(n):
+                distancia(quedas[k % len(quedas)], grid, indice)
+            return time.perf_counter() - inicio
+
+        # Quatro linhas cheias embaixo; cada operação precisa de um grid novo,
+        # copiado (e indexado) antes do cronômetro
+        cheio = tabuleiro_roteirizado(preenchimento, rng, cheias=4)
+        tocadas = range(LINHAS - 4, LINHAS)
+
+        def remover_varredura(n, cheio=cheio):
+            grids = [[list(linha) for linha in cheio] for _ in range(n)]
+            remover = nucleo.remover_linhas
+            inicio = time.perf_counter()
+            for g in grids:
+                remover(g)
+            return time.perf_counter() - inicio
+
+        def remover_indice(n, cheio=cheio):
+            grids = [[list(linha) for linha in cheio] for _ in range(n)]
+            indices = [Indice(g) for g in grids]
+            remover = nucleo.remover_linhas
+            inicio = time.perf_counter()
+            for g, i in zip(grids, indices):
+                remover(g, i, tocadas)
+            return time.perf_counter() - inicio
+
+        resultados[f"motor.colisao.{sufixo}"] = medir_caso(colisao)
+        resultados[f"motor.distancia_queda.{sufixo}"] = medir_caso(distancia_queda)
+        resultados[f"motor.remover_linhas.varredura.{sufixo}"] = medir_caso(remover_varredura)
+        resultados[f"motor.remover_linhas.indice.{sufixo}"] = medir_caso(remover_indice)
+
+    pecas = [Peca(0, 0, forma) for forma in FORMAS]
+
+    def rotacionar(n):
+        girar = nucleo.rotacionar
+        inicio = time.perf_counter()
+        for k in range(n):
+            girar(pecas[k % len(pecas)])
+        return time.perf_counter() - inicio
+
+    resultados["motor.rotacionar"] = medir_caso(rotacionar)
+    return resultados
+
+# --- RENDER ---
+def _iniciar_tela():
+    # Sempre sem janela: os números não dependem do compositor da máquina
+    os.environ["SDL_VIDEODRIVER"] = "dummy"
+    import main
+    main.iniciar_pygame()
+    main.esperar_fontes()
+    return main
+
+def _fundo(main, largura, altura):
+    import pygame
+    caminho = os.path.join(os.path.dirname(os.path.abspath(__file__)), "img", "bg.jpg")
+    try:
+        imagem = pygame.image.load(caminho)
+    except (pygame.error, FileNotFoundError):
+        return None
+    return pygame.transform.scale(imagem, (largura, altura)).convert()
+
+def _render(medir_caso):
+    import pygame
+    main = _iniciar_tela()
+    resultados = {}
+    for largura, altura in RESOLUCOES:
+        tela = pygame.display.set_mode((largura, altura))
+        main.limpar_atlas()
+        imagem = _fundo(main, largura, altura)
+        resolucao = f"{largura}x{altura}"
+
+        for preenchimento in PREENCHIMENTOS:
+            sufixo = f"{resolucao}.{_nome_preenchimento(preenchimento)}"
+            jogo = Jogo(random.Random(SEED))
+            jogo.grid = tabuleiro_roteirizado(preenchimento, random.Random(SEED))
+            camadas = main.Camadas()
+            sujos = main.RetangulosSujos()
+
+            def quadro(n, reconstruir=False, mexer=False, camadas=camadas, sujos=sujos, jogo=jogo):
+                inicio = time.perf_counter()
+                for k in range(n):
+                    if reconstruir:
+                        camadas.invalidar()
+                    if mexer:
+                        jogo.step(ESQUERDA if k % 2 else DIREITA)
+                    else:
+                        sujos.invalidar()
+                    camadas.preparar(imagem, largura, altura, True, jogo.grid, jogo.peca)
+                    sujos.quadro(tela, camadas, main.elementos_jogo(tela, camadas, jogo))
+                return time.perf_counter() - inicio
+
+            def tabuleiro(n, grid=jogo.grid):
+                inicio = time.perf_counter()
+                for _ in range(n):
+                    main.desenhar_tabuleiro(tela, grid, 0, 0)
+                return time.perf_counter() - inicio
+
+            quadro(1)  # layout (TAM_BLOCO) e sprites prontos antes de medir
+            resultados[f"render.quadro.{sufixo}"] = medir_caso(quadro)
+            resultados[f"render.quadro_parcial.{sufixo}"] = medir_caso(lambda n: quadro(n, mexer=True))
+            resultados[f"render.reconstruir.{sufixo}"] = medir_caso(lambda n: quadro(n, reconstruir=True))
+            resultados[f"render.desenhar_tabuleiro.{sufixo}"] = medir_caso(tabuleiro)
+
+        def bloco(n):
+            cor = nucleo.CORES[0]
+            inicio = time.perf_counter()
+            for k in range(n):
+                main.desenhar_bloco_cube(tela, (k % 16) * main.TAM_BLOCO, 0, cor)
+            return time.perf_counter() - inicio
+
+        resultados[f"render.desenhar_bloco_cube.{resolucao}"] = medir_caso(bloco)
+
+    def texto(n):
+        inicio = time.perf_counter()
+        for k in range(n):
+            main.desenhar_texto(tela, str(k % 100), 32, 100, 100)
+        return time.perf_counter() - inicio
+
+    def texto_sem_cache(n):
+        # Textos sempre novos: mede a renderização da fonte, não o LRU
+        inicio = time.perf_counter()
+        for k in range(n):
+            main.desenhar_texto(tela, str(10**6 + k), 32, 100, 100)
+        tempo = time.perf_counter() - inicio
+        main.renderizar_texto.cache_clear()
+        return tempo
+
+    resultados["render.desenhar_texto"] = medir_caso(texto)
+    resultados["render.desenhar_texto.sem_cache"] = medir_caso(texto_sem_cache)
+    return resultados
+
+# --- PONTA A PONTA ---
+def gravar_partida(caminho, seed=SEED, pecas=PECAS_PONTA):
+    # Partida do bot (bot.py) com seed fixo, gravada como um replay .ttr
+    from bot import Bot
+    from replay import Gravador
+    jogo = Jogo(random.Random(seed))
+    gravador = Gravador(jogo, caminho, seed)
+    bot = Bot()
+    try:
+        for _ in range(pecas):
+            if jogo.game_over:
+                break
+            bot.jogar(jogo)
+    finally:
+        gravador.fechar()
+        bot.fechar()
+    return jogo
+
+def _ponta(medir_caso, pasta):
+    import replay
+    caminho = os.path.join(pasta, "benchmark.ttr")
+    gravar_partida(caminho)
+    seed, eventos, _final = replay.ler(caminho)
+
+    def motor(n):
+        inicio = time.perf_counter()
+        for _ in range(n):
+            confere, _jogo = replay.reproduzir(caminho)
+            if not confere:
+                raise RuntimeError("o replay não reproduziu a partida gravada")
+        return time.perf_counter() - inicio
+
+    import pygame
+    main = _iniciar_tela()
+    tela = pygame.display.set_mode((main.LARGURA_JANELA, main.ALTURA_JANELA))
+    main.limpar_atlas()
+    imagem = _fundo(main, *tela.get_size())
+
+    def com_tela(n):
+        # Cada step é seguido de um quadro, como se a partida fosse jogada ao vivo
+        largura, altura = tela.get_size()
+        inicio = time.perf_counter()
+        for _ in range(n):
+            jogo = Jogo(random.Random(seed))
+            camadas = main.Camadas()
+            sujos = main.RetangulosSujos()
+            for _delta, acao in eventos:
+                removidas = jogo.step(acao)
+                if jogo.fixada is not None:
+                    if removidas:
+                        camadas.remover_linhas(jogo.fixada)
+                    else:
+                        camadas.fixar(jogo.fixada)
+                camadas.preparar(imagem, largura, altura, False, jogo.grid, jogo.peca)
+                sujos.quadro(tela, camadas, main.elementos_jogo(tela, camadas, jogo))
+        return time.perf_counter() - inicio
+
+    return {
+        "ponta.replay_motor": dict(medir_caso(motor), steps=len(eventos)),
+        "ponta.replay_tela": dict(medir_caso(com_tela), steps=len(eventos)),
+    }
+
+# --- EXECUÇÃO E COMPARAÇÃO ---
+def maquina():
+    import pygame
+    return {
+        "python": platform.python_version(),
+        "implementacao": platform.python_implementation(),
+        "pygame": pygame.version.ver,
+        "sistema": platform.platform(),
+        "processador": platform.processor() or platform.machine(),
+    }
+
+def executar(grupos=GRUPOS, repeticoes=5, tempo_minimo=0.05, mostrar=print):
+    def medir_caso(rodar):
+        return medir(rodar, repeticoes, tempo_minimo)
+
+    resultados = {}
+    with tempfile.TemporaryDirectory() as pasta:
+        for grupo in grupos:
+            inicio = time.perf_counter()
+            if grupo == "motor":
+                resultados.update(_motor(medir_caso))
+            elif grupo == "render":
+                resultados.update(_render(medir_caso))
+            elif grupo == "ponta":
+                resultados.update(_ponta(medir_caso, pasta))
+            mostrar(f"{grupo}: {time.perf_counter() - inicio:.1f}s")
+    return {
+        "formato": FORMATO,
+        "data": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "tabuleiro": [COLS, LINHAS],
+        "maquina": maquina(),
+        "resultados": resultados,
+    }
+
+def comparar(atual, base, limite=LIMITE):
+    # [(nome, base_us, atual_us, razão, situação)], situação: "pior", "melhor", "igual",
+    # "novo" (sem base) ou "ausente" (só na base)
+    if atual["tabuleiro"] != base["tabuleiro"]:
+        raise ValueError(f"base medida num tabuleiro {base['tabuleiro'][0]}x{base['tabuleiro'][1]}")
+    linhas = []
+    for nome, resultado in atual["resultados"].items():
+        anterior = base["resultados"].get(nome)
+        if anterior is None:
+            linhas.append((nome, None, resultado["us"], None, "novo"))
+            continue
+        razao = resultado["us"] / anterior["us"]
+        situacao = "pior" if razao > 1 + limite else "melhor" if razao < 1 - limite else "igual"
+        linhas.append((nome, anterior["us"], resultado["us"], razao, situacao))
+    for nome, anterior in base["resultados"].items():
+        if nome not in atual["resultados"]:
+            linhas.append((nome, anterior["us"], None, None, "ausente"))
+    return linhas
+
+def _formatar_us(us):
+    if us is None:
+        return "-"
+    if us >= 1000:
+        return f"{us / 1000:.2f} ms"
+    return f"{us:.2f} µs"
+
+def _ler_json(caminho):
+    with open(caminho, encoding="utf-8") as f:
+        return json.load(f)
+
+def _gravar_json(caminho, dados):
+    with open(caminho, "w", encoding="utf-8") as f:
+        json.dump(dados, f, indent=2)
+        f.write("\n")
+
+if __name__ == "__main__":
+    import argparse
+    parser = argparse.ArgumentParser(description="Benchmarks headless do motor, do desenho e de uma partida inteira")
+    parser.add_argument("--so", default=",".join(GRUPOS), help="grupos separados por vírgula (motor, render, ponta)")
+    parser.add_argument("--repeticoes", type=int, default=5)
+    parser.add_argument("--tempo", type=float, default=0.05, help="duração mínima de cada lote em segundos")
+    parser.add_argument("--saida", metavar="ARQUIVO", help="grava os resultados em JSON")
+    parser.add_argument("--base", metavar="ARQUIVO", help="compara com uma base gravada antes")
+    parser.add_argument("--gravar-base", metavar="ARQUIVO", help="grava os resultados como nova base")
+    parser.add_argument("--limite", type=float, default=LIMITE, help="piora relativa tolerada (0.15 = 15%%)")
+    a = parser.parse_args()
+
+    grupos = [grupo.strip() for grupo in a.so.split(",") if grupo.strip()]
+    desconhecidos = set(grupos) - set(GRUPOS)
+    if desconhecidos:
+        parser.error(f"grupos desconhecidos: {', '.join(sorted(desconhecidos))}")
+
+    atual = executar(grupos, a.repeticoes, a.tempo, mostrar=lambda texto: print(texto, file=sys.stderr))
+    for caminho in (a.saida, a.gravar_base):
+        if caminho:
+            _gravar_json(caminho, atual)
+
+    if not a.base:
+        for nome, resultado in atual["resultados"].items():
+            print(f"{nome:<52} {_formatar_us(resultado['us']):>12}")
+        sys.exit(0)
+
+    base = _ler_json(a.base)
+    if base["maquina"] != atual["maquina"]:
+        print("aviso: a base foi medida em outro ambiente", file=sys.stderr)
+    try:
+        linhas = comparar(atual, base, a.limite)
+    except ValueError as erro:
+        sys.exit(f"{a.base}: {erro}")
+    pioras = 0
+    for nome, anterior, agora, razao, situacao in linhas:
+        # Só o que foi medido agora conta (--so limita os grupos)
+        if situacao == "ausente" and nome.split(".")[0] not in grupos:
+            continue
+        variacao = f"{(razao - 1) * 100:+.1f}%" if razao is not None else ""
+        marca = "  <-- PIOROU" if situacao == "pior" else ""
+        print(f"{nome:<52} {_formatar_us(anterior):>12} {_formatar_us(agora):>12} {variacao:>8} {situacao}{marca}")
+        pioras += situacao == "pior"
+    print(f"{pioras} piora(s) acima de {a.limite * 100:.0f}%")
+    sys.exit(1 if pioras else 0)
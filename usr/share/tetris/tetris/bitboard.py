@@ -0,0 +1,167 @@
+import random
+import time
+
+from nucleo import rotacionar_forma
+
+# --- MOTOR BITBOARD ---
+# Núcleo alternativo das regras: o tabuleiro inteiro é um único inteiro. Cada
+# linha ocupa `largura` bits (linha i a partir do bit (i+1)*largura, a linha 0
+# do inteiro é só parede, acima do topo) e o bit MARGEM + j da linha representa
+# a coluna j. As colunas fora do tabuleiro (paredes) e as linhas abaixo do fundo
+# (chão) já vêm marcadas, então a colisão é um único AND
+# entre o tabuleiro e a máscara deslocada da peça, sem testes de limite.
+#
+# As peças são identificadas por (índice em FORMAS, rotação). As máscaras de
+# cada uma são pré-calculadas, assim rotacionar vira consulta de tabela e uma
+# rotação inválida simplesmente não é aplicada (sem desfazer com 3 giros).
+
+MARGEM = 4  # maior largura de peça: permite x negativo sem deslocamento negativo
+
+def chave_forma(forma):
+    return tuple(tuple(linha) for linha in forma)
+
+class TabelaPecas:
+    def __init__(self, formas, largura):
+        # mascaras[peca][rot] = forma inteira empacotada com passo `largura` por linha
+        self.mascaras = []
+        self.formas = []
+        self.indice = {}  # chave_forma -> (peca, rot)
+        for p, forma in enumerate(formas):
+            mascaras_rot = []
+            formas_rot = []
+            for r in range(4):
+                mascara = 0
+                for i, linha in enumerate(forma):
+                    for j, bloco in enumerate(linha):
+                        if bloco:
+                            mascara |= 1 << (i*largura + MARGEM + j)
+                mascaras_rot.append(mascara)
+                formas_rot.append(forma)
+                self.indice.setdefault(chave_forma(forma), (p, r))
+                forma = rotacionar_forma(forma)
+            self.mascaras.append(mascaras_rot)
+            self.formas.append(formas_rot)
+
+    def identificar(self, forma):
+        return self.indice[chave_forma(forma)]
+
+class MotorBits:
+    def __init__(self, formas, cols, linhas):
+        self.cols = cols
+        self.linhas = linhas
+        self.largura = cols + 2*MARGEM
+        self.tabela = TabelaPecas(formas, self.largura)
+        self.linha_cheia = (1 << self.largura) - 1
+        self.parede = self.linha_cheia ^ (((1 << cols) - 1) << MARGEM)
+        # Linha acima do topo + todas as linhas só com paredes, seguido de MARGEM linhas de chão
+        self.vazio = sum(self.parede << (i*self.largura) for i in range(linhas + 1))
+        self.vazio |= sum(self.linha_cheia << ((linhas + 1 + i)*self.largura) for i in range(MARGEM))
+        self.limpar()
+
+    def limpar(self):
+        self.bits = self.vazio
+        # Cor de cada célula (mesmos valores do grid de nucleo.py: 0 vazio, 1..N)
+        self.cores = [[0] * self.cols for _ in range(self.linhas)]
+
+    def de_grid(self, grid):
+        self.limpar()
+        for i, linha in enumerate(grid):
+            self.cores[i] = list(linha)
+            for j, valor in enumerate(linha):
+                if valor:
+                    self.bits |= 1 << ((i + 1)*self.largura + MARGEM + j)
+
+    def para_grid(self):
+        return [list(linha) for linha in self.cores]
+
+    def linha(self, i):
+        return (self.bits >> ((i + 1)*self.largura)) & self.linha_cheia
+
+    def colisao(self, peca, rot, x, y):
+        return (self.bits & (self.tabela.mascaras[peca][rot] << ((y + 1)*self.largura + x))) != 0
+
+    def rotacionar(self, peca, rot, x, y):
+        # Devolve a nova rotação, ou a atual se a rotação colidir
+        nova = (rot + 1) % 4
+        return rot if self.colisao(peca, nova, x, y) else nova
+
+    def fixar(self, peca, rot, x, y, valor):
+        self.bits |= self.tabela.mascaras[peca][rot] << ((y + 1)*self.largura + x)
+        for i, linha in enumerate(self.tabela.formas[peca][rot]):
+            linha_cores = self.cores[y + i]
+            for j, bloco in enumerate(linha):
+                if bloco:
+                    linha_cores[x + j] = valor
+
+    def remover_linhas(self, inicio=0, fim=None):
+        # Só as linhas tocadas pela última peça precisam ser verificadas
+        if fim is None:
+            fim = self.linhas
+        removidas = 0
+        for i in range(max(inicio, 0), min(fim, self.linhas)):
+            if self.linha(i) == self.linha_cheia:
+                # Linhas acima de i descem uma posição e entra uma linha vazia no topo
+                corte = (i + 1)*self.largura
+                acima = self.bits & ((1 << corte) - 1)
+                abaixo = (self.bits >> (corte + self.largura)) << (corte + self.largura)
+                self.bits = abaixo | (acima << self.largura) | self.parede
+                del self.cores[i]
+                self.cores.insert(0, [0] * self.cols)
+                removidas += 1
+        return removidas
+
+# --- BENCHMARK ---
+# python bitboard.py [chamadas] compara colisao() de nucleo.py com MotorBits.colisao
+# no mesmo tabuleiro roteirizado, conferindo antes que os resultados são iguais.
+def _tabuleiro_roteirizado(cols, linhas, rng):
+    grid = [[0] * cols for _ in range(linhas)]
+    for i in range(linhas // 2, linhas):
+        for j in range(cols):
+            if rng.random() < 0.6:
+                grid[i][j] = rng.randint(1, 7)
+    return grid
+
+def _benchmark(chamadas):
+    import nucleo
+
+    rng = random.Random(1234)
+    grid = _tabuleiro_roteirizado(nucleo.COLS, nucleo.LINHAS, rng)
+    motor = MotorBits(nucleo.FORMAS, nucleo.COLS, nucleo.LINHAS)
+    motor.de_grid(grid)
+
+    sondas = []
+    for _ in range(1000):
+        p = rng.randrange(len(nucleo.FORMAS))
+        r = rng.randrange(4)
+        forma = motor.tabela.formas[p][r]
+        x = rng.randint(-1, nucleo.COLS - len(forma[0]) + 1)
+        y = rng.randint(0, nucleo.LINHAS - len(forma))
+        sondas.append((nucleo.Peca(x, y, forma), p, r, x, y))
+
+    for peca, p, r, x, y in sondas:
+        assert nucleo.colisao(peca, grid) == motor.colisao(p, r, x, y), (p, r, x, y)
+
+    repeticoes = max(1, chamadas // len(sondas))
+
+    inicio = time.perf_counter()
+    colisao = nucleo.colisao
+    for _ in range(repeticoes):
+        for peca, _p, _r, _x, _y in sondas:
+            colisao(peca, grid)
+    tempo_lista = time.perf_counter() - inicio
+
+    inicio = time.perf_counter()
+    colisao_bits = motor.colisao
+    for _ in range(repeticoes):
+        for _peca, p, r, x, y in sondas:
+            colisao_bits(p, r, x, y)
+    tempo_bits = time.perf_counter() - inicio
+
+    total = repeticoes * len(sondas)
+    print(f"colisao (lista):    {total} chamadas em {tempo_lista:.3f}s")
+    print(f"colisao (bitboard): {total} chamadas em {tempo_bits:.3f}s")
+    print(f"ganho: {tempo_lista / tempo_bits:.1f}x")
+
+if __name__ == "__main__":
+    import sys
+    _benchmark(int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000)
@@ -0,0 +1,191 @@
+import functools
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from nucleo import COLS, LINHAS, ESQUERDA, DIREITA, BAIXO, GIRAR, GRAVIDADE, Jogo, rotacionar_forma
+
+# --- BOT (JOGADOR AUTOMÁTICO) ---
+# Para cada peça, enumera todas as posições alcançáveis (rotação, coluna) a partir
+# de onde a peça nasceu, solta cada uma e pontua o tabuleiro resultante com uma
+# heurística (altura agregada, linhas, buracos, irregularidade). Com previsão,
+# cada candidata também é combinada com a melhor jogada da próxima peça.
+#
+# O tabuleiro é representado como uma tupla de LINHAS inteiros (bit j = coluna j),
+# o que deixa a colisão barata. Tabuleiros quase nunca se repetem numa partida
+# (nem os candidatos da previsão), então não há cache por tabuleiro. Só as
+# rotações de cada forma se repetem, e elas são calculadas uma vez.
+
+# Pesos da heurística
+PESO_ALTURA = -0.510066
+PESO_LINHAS = 0.760666
+PESO_BURACOS = -0.35663
+PESO_IRREGULARIDADE = -0.184483
+
+# Modo bot do jogo (tecla B): TETRIS_BOT_PREVISAO=1 considera a próxima peça e
+# TETRIS_BOT_TRABALHADORES=N divide a previsão entre N processos
+PREVISAO = bool(int(os.environ.get("TETRIS_BOT_PREVISAO", 0)))
+TRABALHADORES = int(os.environ.get("TETRIS_BOT_TRABALHADORES", 0))
+
+CHEIA = (1 << COLS) - 1
+
+def de_grid(grid):
+    return tuple(sum(1 << j for j, valor in enumerate(linha) if valor) for linha in grid)
+
+def mascaras(forma):
+    return tuple(sum(1 << j for j, bloco in enumerate(linha) if bloco) for linha in forma)
+
+def colide(linhas, masc, x, y):
+    if x < 0 or y + len(masc) > LINHAS:
+        return True
+    for i, m in enumerate(masc):
+        m <<= x
+        if m > CHEIA or linhas[y + i] & m:
+            return True
+    return False
+
+def posicionar(linhas, masc, x, y):
+    # Fixa a peça e remove as linhas cheias: (novo tabuleiro, linhas removidas)
+    novas = list(linhas)
+    for i, m in enumerate(masc):
+        novas[y + i] |= m << x
+    restantes = [linha for linha in novas if linha != CHEIA]
+    removidas = LINHAS - len(restantes)
+    return tuple([0] * removidas + restantes), removidas
+
+@functools.lru_cache(maxsize=None)
+def _rotacoes(forma):
+    # (máscaras, repetida) das 4 rotações de uma forma (tupla de tuplas); repetida
+    # marca uma rotação igual a uma anterior (ex.: O, ou S/Z/I a partir da 2ª)
+    rotacoes = []
+    vistas = set()
+    for rot in range(4):
+        if rot:
+            forma = rotacionar_forma(forma)
+        masc = mascaras(forma)
+        rotacoes.append((masc, masc in vistas))
+        vistas.add(masc)
+    return tuple(rotacoes)
+
+def jogadas(linhas, forma, x0, y0):
+    # Gera (acoes, tabuleiro resultante, linhas removidas) para cada posição alcançável
+    # Acima da primeira linha ocupada a peça cai livremente
+    topo = next((i for i, linha in enumerate(linhas) if linha), LINHAS)
+    for rot, (masc, repetida) in enumerate(_rotacoes(tuple(map(tuple, forma)))):
+        if colide(linhas, masc, x0, y0):
+            # Jogo.step desfaz uma rotação que colide: as seguintes também não são alcançáveis
+            break
+        if repetida:
+            continue
+        for passo, acao in ((-1, ESQUERDA), (1, DIREITA)):
+            x = x0 if passo < 0 else x0 + 1
+            while not colide(linhas, masc, x, y0):
+                y = max(y0, topo - len(masc))
+                while not colide(linhas, masc, x, y + 1):
+                    y += 1
+                acoes = [GIRAR] * rot + [acao] * abs(x - x0) + [BAIXO] * (y - y0)
+                yield (acoes, *posicionar(linhas, masc, x, y))
+                x += passo
+
+def avaliar(linhas):
+    # Altura agregada, buracos e irregularidade do tabuleiro (sem as linhas removidas)
+    alturas = [0] * COLS
+    acima = 0
+    buracos = 0
+    for i, linha in enumerate(linhas):
+        if not linha and not acima:
+            continue
+        novas = linha & ~acima
+        while novas:
+            bit = novas & -novas
+            alturas[bit.bit_length() - 1] = LINHAS - i
+            novas ^= bit
+        if acima:
+            buracos += (acima & ~linha).bit_count()
+        acima |= linha
+    irregularidade = sum(abs(a - b) for a, b in zip(alturas, alturas[1:]))
+    return PESO_ALTURA*sum(alturas) + PESO_BURACOS*buracos + PESO_IRREGULARIDADE*irregularidade
+
+def pontuar(linhas, removidas):
+    return avaliar(linhas) + PESO_LINHAS*removidas
+
+def _melhor_continuacao(args):
+    # Melhor pontuação da próxima peça sobre um tabuleiro candidato (roda nos workers)
+    linhas, removidas, forma_proxima = args
+    melhor = None
+    for _acoes, resultado, removidas_proxima in jogadas(linhas, forma_proxima, 0, 0):
+        nota = pontuar(resultado, removidas + removidas_proxima)
+        if melhor is None or nota > melhor:
+            melhor = nota
+    # Sem jogada para a próxima peça = game over
+    return float("-inf") if melhor is None else melhor
+
+class Bot:
+    def __init__(self, previsao=PREVISAO, trabalhadores=TRABALHADORES):
+        self.previsao = previsao
+        self.executor = ProcessPoolExecutor(trabalhadores) if trabalhadores > 1 else None
+
+    def fechar(self):
+        if self.executor is not None:
+            self.executor.shutdown()
+            self.executor = None
+
+    def planejar(self, jogo):
+        # Lista de ações que leva a peça atual até a melhor posição
+        linhas = de_grid(jogo.grid)
+        candidatas = list(jogadas(linhas, jogo.peca.forma, jogo.peca.x, jogo.peca.y))
+        if not candidatas:
+            return []
+        if self.previsao:
+            # A próxima peça nasce em (0, 0)
+            args = [(resultado, removidas, jogo.proxima.forma) for _a, resultado, removidas in candidatas]
+            if self.executor is not None:
+                notas = list(self.executor.map(_melhor_continuacao, args, chunksize=4))
+            else:
+                notas = [_melhor_continuacao(a) for a in args]
+        else:
+            notas = [pontuar(resultado, removidas) for _a, resultado, removidas in candidatas]
+        melhor = max(range(len(candidatas)), key=notas.__getitem__)
+        return candidatas[melhor][0]
+
+    def jogar(self, jogo, passo=None):
+        # Executa a jogada planejada e trava a peça: devolve as linhas removidas.
+        # passo(acao) substitui jogo.step (main.py cronometra o travamento)
+        passo = passo or jogo.step
+        for acao in self.planejar(jogo):
+            passo(acao)
+        linhas_removidas = passo(GRAVIDADE)
+        while jogo.fixada is None and not jogo.game_over:
+            linhas_removidas = passo(GRAVIDADE)
+        return linhas_removidas
+
+# --- TESTE DE RESISTÊNCIA (HEADLESS) ---
+# python bot.py [--pecas N] [--previsao] [--trabalhadores N] [--seed S]
+def _resistencia(pecas, previsao, trabalhadores, seed):
+    import random
+    jogo = Jogo(random.Random(seed))
+    bot = Bot(previsao=previsao, trabalhadores=trabalhadores)
+    jogadas_feitas = linhas = partidas = 0
+    inicio = time.perf_counter()
+    try:
+        while jogadas_feitas < pecas:
+            if jogo.game_over:
+                partidas += 1
+                jogo.reiniciar()
+            linhas += bot.jogar(jogo)
+            jogadas_feitas += 1
+    finally:
+        bot.fechar()
+    tempo = time.perf_counter() - inicio
+    print(f"{jogadas_feitas} peças em {tempo:.2f}s ({jogadas_feitas / tempo:.0f} peças/s)")
+    print(f"linhas: {linhas}  game overs: {partidas}  pontuação atual: {jogo.pontuacao}")
+
+if __name__ == "__main__":
+    import argparse
+    parser = argparse.ArgumentParser(description="Bot de Tetris sem interface gráfica")
+    parser.add_argument("--pecas", type=int, default=10000)
+    parser.add_argument("--previsao", action="store_true", default=PREVISAO, help="considera a próxima peça")
+    parser.add_argument("--trabalhadores", type=int, default=TRABALHADORES, help="processos para a previsão")
+    parser.add_argument("--seed", type=int, default=0)
+    a = parser.parse_args()
+    _resistencia(a.pecas, a.previsao, a.trabalhadores, a.seed)
@@ -0,0 +1,164 @@
+import asyncio
+import random
+
+from nucleo import COLS, LINHAS, FORMAS, ESQUERDA, DIREITA, BAIXO, GIRAR, QUEDA, Jogo, Peca
+from servidor import PORTA, ENTRAR, ESTATISTICAS, PARTIDA, ESTADO, PECA, LIXO, FIM, CAMPOS
+
+# --- CLIENTE DO SERVIDOR VERSUS ---
+# Cliente do protocolo de servidor.py. O estado recebido é espelhado num Jogo
+# local (só para consulta: quem aplica as regras é o servidor).
+#
+#   python cliente.py --bot             joga uma partida com o bot (bot.py), como
+#                                       adversário local no lugar de um segundo jogador
+#   python cliente.py --carga N         N sessões simuladas com ações aleatórias;
+#                                       mostra vazão e o jitter da roda do servidor
+# --porta / --unix escolhem o servidor, como em servidor.py.
+
+async def conectar(porta=PORTA, unix=None):
+    if unix:
+        return await asyncio.open_unix_connection(unix)
+    return await asyncio.open_connection("127.0.0.1", porta)
+
+class Cliente:
+    def __init__(self, leitor, escritor):
+        self.leitor = leitor
+        self.escritor = escritor
+        self.jogo = Jogo(random.Random())
+        self.venceu = None  # None enquanto a partida não acabou
+        self.mensagens = 0
+
+    def enviar(self, *bytes_):
+        self.escritor.write(bytes(bytes_))
+
+    async def _ler_peca(self, cabecalho):
+        # A cor não é transmitida: a do espelho é sorteada
+        _, x, y, altura, largura = CAMPOS[PECA].unpack(cabecalho)
+        mascaras = await self.leitor.readexactly(altura)
+        forma = [[(mascara >> j) & 1 for j in range(largura)] for mascara in mascaras]
+        return Peca(x, y, forma, self.jogo.rng)
+
+    async def receber(self):
+        # Lê uma mensagem, atualiza o espelho e devolve (tipo, campos)
+        tipo = (await self.leitor.readexactly(1))[0]
+        campos = CAMPOS[tipo]
+        cabecalho = bytes([tipo]) + await self.leitor.readexactly(campos.size - 1)
+        self.mensagens += 1
+        if tipo == PECA:
+            self.jogo.peca = await self._ler_peca(cabecalho)
+            return tipo, None
+        if tipo == ESTADO:
+            _, pontuacao, linhas_totais, nivel, proxima = campos.unpack(cabecalho)
+            celulas = await self.leitor.readexactly(COLS * LINHAS)
+            self.jogo.grid = [list(celulas[i:i + COLS]) for i in range(0, COLS * LINHAS, COLS)]
+            self.jogo.pontuacao, self.jogo.linhas_totais, self.jogo.nivel = pontuacao, linhas_totais, nivel
+            self.jogo.proxima = Peca(0, 0, FORMAS[proxima], self.jogo.rng)
+            cabecalho_peca = await self.leitor.readexactly(CAMPOS[PECA].size)
+            self.jogo.peca = await self._ler_peca(cabecalho_peca)
+            return tipo, None
+        if tipo == PARTIDA:
+            _, cols, linhas = campos.unpack(cabecalho)
+            if (cols, linhas) != (COLS, LINHAS):
+                raise ValueError(f"servidor usa um tabuleiro {cols}x{linhas}")
+            self.venceu = None
+            return tipo, None
+        if tipo == LIXO:
+            return tipo, campos.unpack(cabecalho)[1]
+        if tipo == FIM:
+            self.venceu = bool(campos.unpack(cabecalho)[1])
+            return tipo, self.venceu
+        return tipo, campos.unpack(cabecalho)[1:]
+
+    async def fechar(self):
+        self.escritor.close()
+        try:
+            await self.escritor.wait_closed()
+        except ConnectionError:
+            pass
+
+# --- ADVERSÁRIO LOCAL (BOT) ---
+async def jogar_bot(porta=PORTA, unix=None):
+    from bot import Bot
+    cliente = Cliente(*await conectar(porta, unix))
+    bot = Bot()
+    cliente.enviar(ENTRAR)
+    anterior = None
+    while cliente.venceu is None:
+        tipo, _ = await cliente.receber()
+        # Cada ESTADO traz uma peça nova (o que vem depois de LIXO é a mesma
+        # peça, já jogada): planeja sobre o espelho e solta a peça
+        if tipo == ESTADO and anterior != LIXO:
+            cliente.enviar(*bot.planejar(cliente.jogo), QUEDA)
+        anterior = tipo
+    jogo = cliente.jogo
+    print(f"{'venceu' if cliente.venceu else 'perdeu'}  pontuação: {jogo.pontuacao}  linhas: {jogo.linhas_totais}")
+    await cliente.fechar()
+
+# --- GERADOR DE CARGA ---
+ACOES_CARGA = [ESQUERDA, DIREITA, BAIXO, GIRAR, ESQUERDA, DIREITA, BAIXO, QUEDA]
+
+async def estatisticas(porta=PORTA, unix=None):
+    # (partidas, passos, voltas da roda, atraso médio, p99, máximo) do servidor
+    cliente = Cliente(*await conectar(porta, unix))
+    cliente.enviar(ESTATISTICAS)
+    tipo, campos = await cliente.receber()
+    await cliente.fechar()
+    return campos
+
+async def _ler_carga(cliente, contagem):
+    # Entra de novo na fila a cada partida encerrada
+    while True:
+        tipo, _ = await cliente.receber()
+        if tipo == FIM:
+            contagem["partidas"] += 1
+            cliente.enviar(ENTRAR)
+
+async def gerar_carga(sessoes, segundos, intervalo_ms=100, porta=PORTA, unix=None, grupos=10):
+    # Uma tarefa de leitura por sessão, mas um único laço de envio: a cada
+    # intervalo_ms / grupos, um grupo de sessões manda uma ação aleatória
+    rng = random.Random()
+    contagem = {"acoes": 0, "partidas": 0}
+    _partidas, passos_antes, _voltas, *_ = await estatisticas(porta, unix)
+    clientes = [Cliente(*await conectar(porta, unix)) for _ in range(sessoes)]
+    leituras = [asyncio.create_task(_ler_carga(cliente, contagem)) for cliente in clientes]
+    for cliente in clientes:
+        cliente.enviar(ENTRAR)
+
+    loop = asyncio.get_running_loop()
+    inicio = loop.time()
+    fatia = intervalo_ms / 1000 / grupos
+    rodada = 0
+    while loop.time() - inicio < segundos:
+        grupo = clientes[rodada % grupos::grupos]
+        for cliente in grupo:
+            cliente.enviar(rng.choice(ACOES_CARGA))
+        contagem["acoes"] += len(grupo)
+        rodada += 1
+        await asyncio.sleep(max(0.0, inicio + rodada * fatia - loop.time()))
+    tempo = loop.time() - inicio
+    for leitura in leituras:
+        leitura.cancel()
+    mensagens = sum(cliente.mensagens for cliente in clientes)
+    await asyncio.gather(*(cliente.fechar() for cliente in clientes))
+
+    _partidas, passos, _voltas, media, p99, maximo = await estatisticas(porta, unix)
+
+    print(f"{sessoes} sessões por {tempo:.1f}s")
+    print(f"ações enviadas: {contagem['acoes'] / tempo:.0f}/s  mensagens recebidas: {mensagens / tempo:.0f}/s"
+          f"  partidas encerradas: {contagem['partidas']}")
+    print(f"servidor: {(passos - passos_antes) / tempo:.0f} passos/s; atraso da roda média {media:.2f} ms"
+          f"  p99 {p99:.2f} ms  máx {maximo:.2f} ms")
+
+if __name__ == "__main__":
+    import argparse
+    parser = argparse.ArgumentParser(description="Cliente do servidor versus")
+    parser.add_argument("--porta", type=int, default=PORTA)
+    parser.add_argument("--unix", metavar="CAMINHO")
+    parser.add_argument("--bot", action="store_true", help="joga uma partida com o bot")
+    parser.add_argument("--carga", type=int, metavar="SESSOES", help="gerador de carga")
+    parser.add_argument("--segundos", type=float, default=10)
+    parser.add_argument("--intervalo", type=float, default=100, help="ms entre ações de cada sessão")
+    a = parser.parse_args()
+    if a.carga:
+        asyncio.run(gerar_carga(a.carga, a.segundos, a.intervalo, a.porta, a.unix))
+    else:
+        asyncio.run(jogar_bot(a.porta, a.unix))
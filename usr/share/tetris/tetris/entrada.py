@@ -0,0 +1,59 @@
+import os
+
+from nucleo import ESQUERDA, DIREITA, BAIXO, COLS
+
+# --- REPETIÇÃO DE TECLAS (DAS/ARR) ---
+# Segurar ESQUERDA/DIREITA move a peça uma vez no KEYDOWN, espera DAS ms e então
+# repete a cada ARR ms; BAIXO (queda suave) repete a cada ARR_QUEDA ms desde o
+# início. O tempo é avançado pela lógica em passo fixo de main.py, não pelo
+# KEYDOWN repetido do sistema. ARR = 0 leva a peça direto até a parede.
+#
+# TETRIS_DAS, TETRIS_ARR e TETRIS_ARR_QUEDA (ms) sobrescrevem os padrões.
+
+DAS_MS = int(os.environ.get("TETRIS_DAS", 170))
+ARR_MS = int(os.environ.get("TETRIS_ARR", 50))
+ARR_QUEDA_MS = int(os.environ.get("TETRIS_ARR_QUEDA", 50))
+
+def _repeticoes(tempo, das, arr):
+    # Quantas repetições já aconteceram depois de segurar a tecla por tempo ms
+    if tempo < das:
+        return 0
+    if arr <= 0:
+        return COLS
+    return int((tempo - das) // arr) + 1
+
+class Repeticao:
+    def __init__(self, das=DAS_MS, arr=ARR_MS, arr_queda=ARR_QUEDA_MS):
+        self.atrasos = {
+            ESQUERDA: (das, arr),
+            DIREITA: (das, arr),
+            BAIXO: (arr_queda, arr_queda),
+        }
+        self.segurando = {}  # ação -> ms segurada
+
+    def pressionar(self, acao):
+        if acao not in self.atrasos:
+            return
+        # A última direção pressionada vence
+        if acao == ESQUERDA:
+            self.segurando.pop(DIREITA, None)
+        elif acao == DIREITA:
+            self.segurando.pop(ESQUERDA, None)
+        self.segurando[acao] = 0
+
+    def soltar(self, acao):
+        self.segurando.pop(acao, None)
+
+    def limpar(self):
+        # Pausa, perda de foco: os KEYUP podem não chegar
+        self.segurando.clear()
+
+    def avancar(self, ms):
+        # Ações repetidas ao avançar ms
+        acoes = []
+        for acao, tempo in self.segurando.items():
+            das, arr = self.atrasos[acao]
+            novo = tempo + ms
+            acoes += [acao] * (_repeticoes(novo, das, arr) - _repeticoes(tempo, das, arr))
+            self.segurando[acao] = novo
+        return acoes
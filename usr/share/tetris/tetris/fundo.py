@@ -0,0 +1,146 @@
+import os
+import queue
+import threading
+
+import pygame
+
+# --- CACHE DA IMAGEM DE FUNDO ---
+# A imagem é decodificada uma vez só e cada resolução pedida vira uma variante
+# escalada já no formato de pixel do display, guardada em memória e em disco
+# (os bytes crus da superfície, sem JPEG para decodificar, escala para refazer
+# nem convert() para pagar). O nome do arquivo em disco leva o mtime da imagem
+# original, o tamanho e o formato: trocar bg.jpg invalida as variantes antigas.
+#
+# Decodificar, escalar e converter acontece numa thread; enquanto a variante não
+# fica pronta, obter() devolve None e a tela usa a cor lisa COR_FALLBACK. Quando
+# fica pronta, um evento FUNDO_PRONTO acorda o loop principal (inclusive no modo
+# ocioso). Na thread principal, obter() é só uma consulta ao dicionário.
+#
+# Pasta do cache em disco: TETRIS_CACHE ou $XDG_CACHE_HOME/tetris-cube.
+
+COR_FALLBACK = (10, 10, 15)
+FUNDO_PRONTO = pygame.event.custom_type()
+
+# Formato sem display aberto: RGB de 24 bits
+_FORMATO_RGB = (24, (0xFF, 0xFF00, 0xFF0000, 0))
+
+def pasta_cache_padrao():
+    pasta = os.environ.get("TETRIS_CACHE")
+    if pasta:
+        return pasta
+    base = os.environ.get("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache")
+    return os.path.join(base, "tetris-cube")
+
+def formato_display():
+    # (bits por pixel, máscaras) da tela atual: uma Surface criada com eles tem o
+    # formato que convert() produziria, e o blit na tela vira cópia direta
+    tela = pygame.display.get_surface()
+    if tela is None:
+        return _FORMATO_RGB
+    return tela.get_bitsize(), tuple(tela.get_masks())
+
+class CacheFundo:
+    def __init__(self, caminho, pasta_cache=None):
+        self.caminho = caminho
+        self.pasta_cache = pasta_cache if pasta_cache is not None else pasta_cache_padrao()
+        try:
+            self.mtime = os.stat(caminho).st_mtime_ns
+        except OSError:
+            self.mtime = None  # sem imagem: fica na cor lisa
+        self.original = None
+        self.prontas = {}  # (largura, altura) -> Surface no formato do display
+        self.pedidas = set()
+        self.trava = threading.Lock()
+        self.fila = queue.Queue()
+        self.thread = None
+
+    def preparar(self, tamanho):
+        # Pede a variante sem esperar por ela (ex.: a do outro modo de tela)
+        if self.mtime is None or tamanho in self.pedidas:
+            return
+        self.pedidas.add(tamanho)
+        if self.thread is None:
+            self.thread = threading.Thread(target=self._trabalhar, name="fundo", daemon=True)
+            self.thread.start()
+        # O formato é lido aqui, na thread principal, dona do display
+        self.fila.put((tamanho, formato_display()))
+
+    def obter(self, largura, altura):
+        # Superfície pronta para blit ou None (ainda carregando / sem imagem).
+        # A thread só insere no dicionário: a consulta dispensa a trava.
+        superficie = self.prontas.get((largura, altura))
+        if superficie is None:
+            self.preparar((largura, altura))
+        return superficie
+
+    def pronto(self, largura, altura):
+        # Variante já na tela (sem imagem também conta: a tela fica na cor lisa)
+        return self.mtime is None or (largura, altura) in self.prontas
+
+    def fechar(self):
+        if self.thread is not None:
+            self.fila.put(None)
+            self.thread.join()
+            self.thread = None
+
+    def _arquivo_cache(self, tamanho, formato):
+        bits, mascaras = formato
+        nome_formato = f"{bits}-" + "-".join(f"{mascara:x}" for mascara in mascaras)
+        return os.path.join(self.pasta_cache, f"bg-{self.mtime}-{tamanho[0]}x{tamanho[1]}-{nome_formato}.raw")
+
+    def _trabalhar(self):
+        while True:
+            pedido = self.fila.get()
+            if pedido is None:
+                return
+            tamanho, formato = pedido
+            try:
+                superficie = self._ler_cache(tamanho, formato)
+                if superficie is None:
+                    superficie = self._escalar(tamanho, formato)
+                    self._gravar_cache(tamanho, formato, superficie)
+            except (pygame.error, OSError):
+                continue
+            with self.trava:
+                self.prontas[tamanho] = superficie
+            try:
+                pygame.event.post(pygame.event.Event(FUNDO_PRONTO))
+            except pygame.error:
+                pass  # pygame já encerrado
+
+    def _ler_cache(self, tamanho, formato):
+        try:
+            with open(self._arquivo_cache(tamanho, formato), "rb") as f:
+                dados = f.read()
+        except OSError:
+            return None
+        bits, mascaras = formato
+        superficie = pygame.Surface(tamanho, 0, bits, mascaras)
+        # Bytes crus da superfície, com o preenchimento de cada linha (pitch)
+        if len(dados) != superficie.get_pitch() * tamanho[1]:
+            return None
+        superficie.get_buffer().write(dados)
+        return superficie
+
+    def _escalar(self, tamanho, formato):
+        if self.original is None:
+            self.original = pygame.image.load(self.caminho)
+        bits, mascaras = formato
+        superficie = pygame.Surface(tamanho, 0, bits, mascaras)
+        superficie.blit(pygame.transform.scale(self.original, tamanho), (0, 0))
+        return superficie
+
+    def _gravar_cache(self, tamanho, formato, superficie):
+        # Escrita atômica; variantes de um bg.jpg antigo são apagadas
+        try:
+            os.makedirs(self.pasta_cache, exist_ok=True)
+            destino = self._arquivo_cache(tamanho, formato)
+            temporario = destino + ".tmp"
+            with open(temporario, "wb") as f:
+                f.write(superficie.get_buffer().raw)
+            os.replace(temporario, destino)
+            for nome in os.listdir(self.pasta_cache):
+                if nome.startswith("bg-") and not nome.startswith(f"bg-{self.mtime}-"):
+                    os.remove(os.path.join(self.pasta_cache, nome))
+        except OSError:
+            pass  # cache em disco é opcional
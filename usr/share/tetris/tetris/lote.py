@@ -0,0 +1,176 @@
+import numpy as np
+
+from nucleo import COLS, LINHAS, CORES, FORMAS, NADA, GRAVIDADE, QUEDA, rotacionar_forma
+
+# --- SIMULADOR EM LOTE (NUMPY) ---
+# Roda N partidas ao mesmo tempo: os tabuleiros ficam num único array
+# (N, LINHAS, COLS) com os mesmos valores do grid de nucleo.py (0 vazio, 1..N
+# índice da cor + 1) e cada step aplica uma ação por tabuleiro com operações
+# vetorizadas. As regras seguem Jogo.step(): movimento/rotação só se não colidir,
+# gravidade que fixa a peça, queda (hard drop), remoção de linhas, pontuação
+# (linhas_removidas * 100 * nivel), nível (linhas_totais // 10 + 1) e a próxima
+# peça entrando em (0, 0).
+#
+# Requer numpy, que não é dependência do jogo (pip install numpy).
+
+def _celulas_formas():
+    # celulas[tipo, rot] = 4 pares (dy, dx) relativos ao canto superior esquerdo,
+    # na mesma rotação horária de nucleo.rotacionar()
+    celulas = np.zeros((len(FORMAS), 4, 4, 2), dtype=np.int16)
+    for tipo, forma in enumerate(FORMAS):
+        for rot in range(4):
+            celulas[tipo, rot] = [(i, j) for i, linha in enumerate(forma) for j, bloco in enumerate(linha) if bloco]
+            forma = rotacionar_forma(forma)
+    return celulas
+
+CELULAS = _celulas_formas()
+
+# Deslocamento (dx, dy, drot) de cada ação; QUEDA é tratada à parte
+_DX = np.array([0, -1, 1, 0, 0, 0, 0], dtype=np.int16)
+_DY = np.array([0, 0, 0, 1, 0, 1, 0], dtype=np.int16)
+_DROT = np.array([0, 0, 0, 0, 1, 0, 0], dtype=np.int16)
+
+class Lote:
+    def __init__(self, n, seed=None, cols=COLS, linhas=LINHAS):
+        self.n = n
+        self.cols = cols
+        self.linhas = linhas
+        self.rng = np.random.default_rng(seed)
+        self.grids = np.zeros((n, linhas, cols), dtype=np.int8)
+        self.tipo = np.zeros(n, dtype=np.int16)
+        self.rot = np.zeros(n, dtype=np.int16)
+        self.x = np.zeros(n, dtype=np.int16)
+        self.y = np.zeros(n, dtype=np.int16)
+        self.cor = np.zeros(n, dtype=np.int8)
+        self.proximo_tipo = np.zeros(n, dtype=np.int16)
+        self.proxima_cor = np.zeros(n, dtype=np.int8)
+        self.pontuacao = np.zeros(n, dtype=np.int64)
+        self.nivel = np.ones(n, dtype=np.int32)
+        self.linhas_totais = np.zeros(n, dtype=np.int32)
+        self.game_over = np.zeros(n, dtype=bool)
+        self.reiniciar()
+
+    def _sortear(self, k):
+        # (tipos, cores) de k peças novas
+        return (self.rng.integers(len(FORMAS), size=k, dtype=np.int16),
+                self.rng.integers(len(CORES), size=k, dtype=np.int8))
+
+    def reiniciar(self, indices=None):
+        # Recomeça os tabuleiros indicados (todos, se None)
+        if indices is None:
+            indices = np.arange(self.n)
+        indices = np.asarray(indices)
+        if indices.dtype == bool:
+            indices = np.flatnonzero(indices)
+        k = len(indices)
+        self.grids[indices] = 0
+        self.tipo[indices], self.cor[indices] = self._sortear(k)
+        self.proximo_tipo[indices], self.proxima_cor[indices] = self._sortear(k)
+        self.rot[indices] = 0
+        self.x[indices] = self.cols//2 - 1
+        self.y[indices] = 0
+        self.pontuacao[indices] = 0
+        self.nivel[indices] = 1
+        self.linhas_totais[indices] = 0
+        self.game_over[indices] = False
+
+    def velocidade_queda(self):
+        return np.maximum(100, 500 - (self.nivel - 1) * 50)
+
+    def colisao(self, indices, tipo, rot, x, y):
+        # Vetor booleano: a peça (tipo, rot) em (x, y) colide no tabuleiro indices[k]?
+        celulas = CELULAS[tipo, rot]
+        ys = y[:, None] + celulas[:, :, 0]
+        xs = x[:, None] + celulas[:, :, 1]
+        fora = (xs < 0) | (xs >= self.cols) | (ys >= self.linhas)
+        ocupada = self.grids[indices[:, None],
+                             np.clip(ys, 0, self.linhas - 1),
+                             np.clip(xs, 0, self.cols - 1)] != 0
+        return (fora | ocupada).any(axis=1)
+
+    def step(self, acoes):
+        # Aplica uma ação por tabuleiro (mesmos códigos de nucleo.py) e devolve
+        # o array de linhas removidas neste step
+        acoes = np.broadcast_to(np.asarray(acoes, dtype=np.int16), (self.n,))
+        invalidas = (acoes < NADA) | (acoes > QUEDA)
+        if invalidas.any():
+            raise ValueError(f"ação inválida: {acoes[invalidas][0]}")
+        removidas = np.zeros(self.n, dtype=np.int32)
+
+        ativos = np.flatnonzero(~self.game_over & (acoes != NADA))
+        if len(ativos) == 0:
+            return removidas
+
+        # Queda: desce até colidir e trava
+        queda = ativos[acoes[ativos] == QUEDA]
+        if len(queda):
+            self._cair(queda)
+            removidas[queda] = self._travar(queda)
+            ativos = ativos[acoes[ativos] != QUEDA]
+            if len(ativos) == 0:
+                return removidas
+
+        a = acoes[ativos]
+        novo_x = self.x[ativos] + _DX[a]
+        novo_y = self.y[ativos] + _DY[a]
+        nova_rot = (self.rot[ativos] + _DROT[a]) % 4
+        colide = self.colisao(ativos, self.tipo[ativos], nova_rot, novo_x, novo_y)
+
+        livres = ativos[~colide]
+        self.x[livres] = novo_x[~colide]
+        self.y[livres] = novo_y[~colide]
+        self.rot[livres] = nova_rot[~colide]
+
+        # Gravidade que colide fixa a peça
+        travar = ativos[colide & (a == GRAVIDADE)]
+        if len(travar):
+            removidas[travar] = self._travar(travar)
+        return removidas
+
+    def gravidade(self):
+        return self.step(GRAVIDADE)
+
+    def _cair(self, indices):
+        # distancia_queda: todos os tabuleiros descem uma linha por vez, cada um
+        # até a próxima posição colidir
+        caindo = indices
+        while len(caindo):
+            y = self.y[caindo] + 1
+            livre = ~self.colisao(caindo, self.tipo[caindo], self.rot[caindo], self.x[caindo], y)
+            caindo = caindo[livre]
+            self.y[caindo] = y[livre]
+
+    def _travar(self, indices):
+        # fixar_peca
+        celulas = CELULAS[self.tipo[indices], self.rot[indices]]
+        ys = self.y[indices, None] + celulas[:, :, 0]
+        xs = self.x[indices, None] + celulas[:, :, 1]
+        self.grids[indices[:, None], ys, xs] = (self.cor[indices] + 1)[:, None]
+
+        # remover_linhas: linhas cheias sobem para o topo (ordenação estável)
+        # e são zeradas, as demais descem mantendo a ordem
+        grids = self.grids[indices]
+        cheias = (grids != 0).all(axis=2)
+        linhas = cheias.sum(axis=1).astype(np.int32)
+        com_linhas = linhas > 0
+        if com_linhas.any():
+            ordem = np.argsort(~cheias[com_linhas], axis=1, kind="stable")
+            compactados = np.take_along_axis(grids[com_linhas], ordem[:, :, None], axis=1)
+            compactados[np.arange(self.linhas)[None, :] < linhas[com_linhas, None]] = 0
+            self.grids[indices[com_linhas]] = compactados
+
+        # Pontuação e Nível (fase)
+        self.linhas_totais[indices] += linhas
+        self.pontuacao[indices] += linhas * 100 * self.nivel[indices]
+        self.nivel[indices] = np.maximum(self.nivel[indices], self.linhas_totais[indices] // 10 + 1)
+
+        # A próxima peça entra em (0, 0) e uma nova é sorteada
+        self.tipo[indices] = self.proximo_tipo[indices]
+        self.cor[indices] = self.proxima_cor[indices]
+        self.rot[indices] = 0
+        self.x[indices] = 0
+        self.y[indices] = 0
+        self.proximo_tipo[indices], self.proxima_cor[indices] = self._sortear(len(indices))
+        self.game_over[indices] = self.colisao(indices, self.tipo[indices], self.rot[indices],
+                                               self.x[indices], self.y[indices])
+        return linhas
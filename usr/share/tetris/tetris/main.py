@@ -1,94 +1,63 @@
+import time
+
+# Começo do import, para o relatório de inicialização (perfil.Inicio)
+INICIO_IMPORT = time.perf_counter()
+
+import functools
 import pygame
-import random
 import os
+import random
+import threading
 
-pygame.init()
+from nucleo import COLS, LINHAS, CORES, NADA, ESQUERDA, DIREITA, BAIXO, GIRAR, GRAVIDADE, QUEDA, Jogo
+from replay import nova_partida_gravada
+from perfil import Perfil, Inicio
+from entrada import Repeticao
+from placar import Placar, jogador_padrao
+from fundo import CacheFundo, COR_FALLBACK
+import salvamento
+
+FIM_IMPORT = time.perf_counter()
 
 # --- CONFIGURAÇÕES ---
 TAM_BLOCO = 40
-COLS, LINHAS = 10, 20
 
-# Configuração inicial do display
-pygame.display.set_caption("Tetris Cube")
-TELA = pygame.display.set_mode((0, 0), pygame.FULLSCREEN)
-LARGURA, ALTURA = TELA.get_size()
+# O display só é aberto em main(): importar este módulo não cria janela
+TELA = None
+LARGURA, ALTURA = 0, 0
 MODO_FULLSCREEN = True
 
-# Dimensões para modo janela (calculadas para caber tabuleiro + painel)
-LARGURA_JANELA = (COLS * TAM_BLOCO) + 300
-ALTURA_JANELA = (LINHAS * TAM_BLOCO) + 100
+# Pasta para gravar as partidas (.ttr, ver replay.py); gravação desligada se vazio
+PASTA_REPLAYS = os.environ.get("TETRIS_REPLAYS", "")
+
+# Arquivo (.csv ou .jsonl) para os tempos por quadro; F3 mostra o overlay de perfil
+ARQUIVO_PERFIL = os.environ.get("TETRIS_PERFIL", "")
+
+# Nome gravado no placar (placar.py); padrão: usuário do sistema
+JOGADOR = jogador_padrao()
+
+# Arquivo (.jsonl) que recebe uma linha com os tempos de cada abertura do jogo
+ARQUIVO_INICIO = os.environ.get("TETRIS_INICIO", "")
+
+# Dimensões para modo janela (calculadas para caber tabuleiro + painel; tabuleiros
+# grandes ficam limitados e o bloco encolhe, ver tamanho_bloco)
+LARGURA_JANELA = min((COLS * TAM_BLOCO) + 300, 1280)
+ALTURA_JANELA = min((LINHAS * TAM_BLOCO) + 100, 900)
 
 # Cores (Mais vibrantes e saturadas baseadas na imagem)
 PRETO = (10, 10, 15)  # Fundo quase preto
 BRANCO = (255, 255, 255)
 CINZA_FUNDO = (20, 20, 20) # Cor base dos quadrados de fundo
 CINZA_BORDA = (35, 35, 35) # Borda dos quadrados de fundo
+COR_GRID = (20, 20, 22) # Blocos vazios do tabuleiro
 
-CORES = [
-    (0, 160, 255),    # Azul Ciano
-    (255, 210, 10),   # Amarelo Ouro
-    (50, 230, 50),    # Verde Vibrante
-    (255, 30, 60),    # Vermelho Vivo
-    (220, 0, 255),    # Roxo/Magenta
-    (255, 120, 0),    # Laranja
-    (0, 80, 255)      # Azul Profundo
-]
-
-# Formas
-FORMAS = [
-    [[1,1,1,1]],             # I
-    [[1,1,1],[0,1,0]],       # T
-    [[1,1,0],[0,1,1]],       # S
-    [[0,1,1],[1,1,0]],       # Z
-    [[1,1],[1,1]],           # O
-    [[1,1,1],[1,0,0]],       # L
-    [[1,1,1],[0,0,1]]        # J
-]
-
-# --- CLASSES E FUNÇÕES ---
-def criar_grid():
-    return [[0 for _ in range(COLS)] for _ in range(LINHAS)]
-
-class Peca:
-    def __init__(self, x, y, forma):
-        self.x = x
-        self.y = y
-        self.forma = forma
-        self.cor = random.choice(CORES)
-
-def colisao(peca, grid, dx=0, dy=0):
-    for i, linha in enumerate(peca.forma):
-        for j, bloco in enumerate(linha):
-            if bloco:
-                x = peca.x + j + dx
-                y = peca.y + i + dy
-                if x < 0 or x >= COLS or y >= LINHAS or grid[y][x]:
-                    return True
-    return False
-
-def fixar_peca(peca, grid):
-    for i, linha in enumerate(peca.forma):
-        for j, bloco in enumerate(linha):
-            if bloco:
-                grid[peca.y + i][peca.x + j] = CORES.index(peca.cor) + 1
-
-def remover_linhas(grid):
-    linhas_removidas = 0
-    for i in range(LINHAS-1,-1,-1):
-        if 0 not in grid[i]:
-            grid.pop(i)
-            grid.insert(0,[0 for _ in range(COLS)])
-            linhas_removidas +=1
-    return linhas_removidas
-
-def rotacionar(peca):
-    peca.forma = [list(x)[::-1] for x in zip(*peca.forma)]
+# --- ATLAS DE SPRITES ---
+# Cada bloco/chanfro é rasterizado uma única vez e depois só copiado com blit.
+# Chave: (largura, altura, cor, fundo, TAM_BLOCO). Deve ser limpo quando o
+# display muda (formato de pixel) ou quando TAM_BLOCO é alterado.
+_atlas = {}
 
-def desenhar_bloco_cube(tela, x, y, cor, fundo=False):
-    # Dimensões e padding para o chanfro (bevel)
-    # Na imagem, o chanfro parece ocupar cerca de 20% do bloco
-    offset = TAM_BLOCO // 5
-    
+def _cores_chanfro(cor, fundo):
     # Cores de sombreamento
     if fundo:
         # Fundo: Cores muito escuras e sutis
@@ -100,34 +69,64 @@ def desenhar_bloco_cube(tela, x, y, cor, fundo=False):
         face_cor = cor
         brilho = (min(cor[0] + 80, 255), min(cor[1] + 80, 255), min(cor[2] + 80, 255))
         sombra = (max(cor[0] - 60, 0), max(cor[1] - 60, 0), max(cor[2] - 60, 0))
+    return face_cor, brilho, sombra
+
+def _renderizar_chanfro(largura, altura, cor, fundo):
+    # Dimensões e padding para o chanfro (bevel)
+    # Na imagem, o chanfro parece ocupar cerca de 20% do bloco
+    offset = TAM_BLOCO // 5
+    face_cor, brilho, sombra = _cores_chanfro(cor, fundo)
+
+    superficie = pygame.Surface((largura, altura))
+    w, h = largura, altura
 
     # Desenhar os 4 trapézios que formam o bevel (chanfro)
     # Topo (mais claro)
-    pygame.draw.polygon(tela, brilho, [
-        (x, y), (x + TAM_BLOCO, y), 
-        (x + TAM_BLOCO - offset, y + offset), (x + offset, y + offset)
-    ])
+    pygame.draw.polygon(superficie, brilho, [(0, 0), (w, 0), (w - offset, offset), (offset, offset)])
     # Esquerda (mais claro)
-    pygame.draw.polygon(tela, brilho, [
-        (x, y), (x + offset, y + offset), 
-        (x + offset, y + TAM_BLOCO - offset), (x, y + TAM_BLOCO)
-    ])
+    pygame.draw.polygon(superficie, brilho, [(0, 0), (offset, offset), (offset, h - offset), (0, h)])
     # Baixo (mais escuro)
-    pygame.draw.polygon(tela, sombra, [
-        (x, y + TAM_BLOCO), (x + offset, y + TAM_BLOCO - offset), 
-        (x + TAM_BLOCO - offset, y + TAM_BLOCO - offset), (x + TAM_BLOCO, y + TAM_BLOCO)
-    ])
+    pygame.draw.polygon(superficie, sombra, [(0, h), (offset, h - offset), (w - offset, h - offset), (w, h)])
     # Direita (mais escuro)
-    pygame.draw.polygon(tela, sombra, [
-        (x + TAM_BLOCO, y), (x + TAM_BLOCO - offset, y + offset), 
-        (x + TAM_BLOCO - offset, y + TAM_BLOCO - offset), (x + TAM_BLOCO, y + TAM_BLOCO)
-    ])
+    pygame.draw.polygon(superficie, sombra, [(w, 0), (w - offset, offset), (w - offset, h - offset), (w, h)])
 
     # Desenhar a face central quadrada
-    pygame.draw.rect(tela, face_cor, (x + offset, y + offset, TAM_BLOCO - 2*offset, TAM_BLOCO - 2*offset))
-    
+    pygame.draw.rect(superficie, face_cor, (offset, offset, w - 2*offset, h - 2*offset))
+
     # Linha preta fina divisória (opcional, na imagem parece ter uma separação mínima)
-    pygame.draw.rect(tela, (5, 5, 5), (x, y, TAM_BLOCO, TAM_BLOCO), 1)
+    pygame.draw.rect(superficie, (5, 5, 5), (0, 0, w, h), 1)
+
+    if pygame.display.get_surface() is not None:
+        superficie = superficie.convert()
+    return superficie
+
+def obter_sprite(largura, altura, cor, fundo=False):
+    chave = (largura, altura, cor, fundo, TAM_BLOCO)
+    sprite = _atlas.get(chave)
+    if sprite is None:
+        sprite = _renderizar_chanfro(largura, altura, cor, fundo)
+        _atlas[chave] = sprite
+    return sprite
+
+def obter_sprite_bloco(cor, fundo=False):
+    return obter_sprite(TAM_BLOCO, TAM_BLOCO, cor, fundo)
+
+def sprites_tabuleiro():
+    # Lista indexada pelo valor da célula no grid: 0 = fundo, 1..N = CORES
+    chave = ("tabuleiro", TAM_BLOCO)
+    sprites = _atlas.get(chave)
+    if sprites is None:
+        sprites = [obter_sprite_bloco(COR_GRID, fundo=True)]
+        sprites += [obter_sprite_bloco(cor) for cor in CORES]
+        _atlas[chave] = sprites
+    return sprites
+
+def limpar_atlas():
+    # Chamar após trocar o modo de vídeo ou TAM_BLOCO
+    _atlas.clear()
+
+def desenhar_bloco_cube(tela, x, y, cor, fundo=False):
+    tela.blit(obter_sprite_bloco(cor, fundo), (x, y))
 
 def desenhar_vidro(tela, rect, cor=(0, 0, 0), alpha=160):
     # Cria uma superfície temporária para o efeito de transparência
@@ -135,49 +134,119 @@ def desenhar_vidro(tela, rect, cor=(0, 0, 0), alpha=160):
     s.fill((*cor, alpha))
     tela.blit(s, (rect.x, rect.y))
     # Borda fina
-    pygame.draw.rect(tela, (60, 60, 60), rect, 2)
+    return pygame.draw.rect(tela, (60, 60, 60), rect, 2)
 
 def desenhar_tabuleiro(tela, grid, tabuleiro_x, tabuleiro_y):
-    # Fundo do tabuleiro com os blocos 3D (para visibilidade da grade)
-    cor_grid = (20, 20, 22) 
-    for i in range(LINHAS):
-        for j in range(COLS):
-            x = tabuleiro_x + j*TAM_BLOCO
-            y = tabuleiro_y + i*TAM_BLOCO
-            desenhar_bloco_cube(tela, x, y, cor_grid, fundo=True)
-    
-    # Peças fixas
-    for i in range(LINHAS):
-        for j in range(COLS):
-            if grid[i][j]:
-                cor = CORES[grid[i][j]-1]
-                desenhar_bloco_cube(tela, tabuleiro_x + j*TAM_BLOCO, tabuleiro_y + i*TAM_BLOCO, cor)
+    # Fundo do tabuleiro com os blocos 3D (para visibilidade da grade) e peças fixas:
+    # um único blit por célula, o índice do grid aponta direto para o sprite
+    sprites = sprites_tabuleiro()
+    tela.blits([
+        (sprites[valor], (tabuleiro_x + j*TAM_BLOCO, tabuleiro_y + i*TAM_BLOCO))
+        for i, linha in enumerate(grid)
+        for j, valor in enumerate(linha)
+    ], doreturn=False)
 
 def desenhar_peca(tela, peca, tabuleiro_x, tabuleiro_y):
+    sprite = obter_sprite_bloco(peca.cor)
     for i, linha in enumerate(peca.forma):
         for j, bloco in enumerate(linha):
             if bloco:
                 x = tabuleiro_x + (peca.x + j)*TAM_BLOCO
                 y = tabuleiro_y + (peca.y + i)*TAM_BLOCO
-                desenhar_bloco_cube(tela, x, y, peca.cor)
+                tela.blit(sprite, (x, y))
+    return pygame.Rect(tabuleiro_x + peca.x*TAM_BLOCO, tabuleiro_y + peca.y*TAM_BLOCO,
+                       len(peca.forma[0])*TAM_BLOCO, len(peca.forma)*TAM_BLOCO)
+
+def desenhar_fantasma(tela, peca, y_fantasma, tabuleiro_x, tabuleiro_y):
+    # Contorno de onde a peça vai parar (Jogo.fantasma)
+    for i, linha in enumerate(peca.forma):
+        for j, bloco in enumerate(linha):
+            if bloco:
+                x = tabuleiro_x + (peca.x + j)*TAM_BLOCO
+                y = tabuleiro_y + (y_fantasma + i)*TAM_BLOCO
+                pygame.draw.rect(tela, peca.cor, (x + 3, y + 3, TAM_BLOCO - 6, TAM_BLOCO - 6), 2)
+    return pygame.Rect(tabuleiro_x + peca.x*TAM_BLOCO, tabuleiro_y + y_fantasma*TAM_BLOCO,
+                       len(peca.forma[0])*TAM_BLOCO, len(peca.forma)*TAM_BLOCO)
+
+def desenhar_recortado(tela, area, desenhar, *args):
+    # Desenha limitado à área (peça que sai da janela visível do tabuleiro)
+    tela.set_clip(area)
+    try:
+        return desenhar(tela, *args).clip(area)
+    finally:
+        tela.set_clip(None)
 
 def desenhar_proxima_peca(tela, proxima, centro_x, y):
     largura_peca = len(proxima.forma[0]) * TAM_BLOCO
     start_x = centro_x - (largura_peca // 2)
+    sprite = obter_sprite_bloco(proxima.cor)
     for i, linha in enumerate(proxima.forma):
         for j, bloco in enumerate(linha):
             if bloco:
-                desenhar_bloco_cube(tela, start_x + j*TAM_BLOCO, y + i*TAM_BLOCO, proxima.cor)
+                tela.blit(sprite, (start_x + j*TAM_BLOCO, y + i*TAM_BLOCO))
+    return pygame.Rect(start_x, y, largura_peca, len(proxima.forma)*TAM_BLOCO)
+
+# --- CACHE DE FONTES E TEXTOS ---
+# SysFont faz uma busca nas fontes do sistema a cada chamada: cada fonte é
+# carregada uma única vez por (família, tamanho, negrito).
+# A primeira busca varre as fontes instaladas (fc-list) e pode levar centenas de
+# ms: ela roda numa thread desde o começo de main(). Até terminar, os textos saem
+# na fonte padrão do pygame e FONTES_PRONTAS avisa o loop para refazer o cache.
+FONTES_PRONTAS = pygame.event.custom_type()
+_fontes_prontas = threading.Event()
+
+# Placar relido (placar.py): só acorda o loop
+PLACAR_ATUALIZADO = pygame.event.custom_type()
+
+def _postar_evento(tipo):
+    # Para as threads de fundo acordarem o loop principal
+    try:
+        pygame.event.post(pygame.event.Event(tipo))
+    except pygame.error:
+        pass  # pygame já encerrado
+
+def buscar_fontes():
+    def buscar():
+        pygame.font.get_fonts()  # preenche a tabela de fontes do sistema
+        _fontes_prontas.set()
+        _postar_evento(FONTES_PRONTAS)
+    if not _fontes_prontas.is_set():
+        threading.Thread(target=buscar, name="fontes", daemon=True).start()
+
+def esperar_fontes():
+    # Para quem desenha fora do loop (benchmark.py): textos já nas fontes do sistema
+    buscar_fontes()
+    _fontes_prontas.wait()
+    obter_fonte.cache_clear()
+    renderizar_texto.cache_clear()
+
+@functools.lru_cache(maxsize=None)
+def obter_fonte(familia, tamanho, negrito=True):
+    if not _fontes_prontas.is_set():
+        fonte = pygame.font.Font(None, tamanho)
+        fonte.set_bold(negrito)
+        return fonte
+    return pygame.font.SysFont(familia, tamanho, bold=negrito)
+
+# Textos renderizados ficam num LRU limitado; cache_info() expõe acertos/falhas
+# para confirmar que o HUD é desenhado a partir do cache entre mudanças de score.
+TAM_CACHE_TEXTO = 256
+
+@functools.lru_cache(maxsize=TAM_CACHE_TEXTO)
+def renderizar_texto(texto, tamanho, cor=BRANCO):
+    return obter_fonte("Arial", tamanho).render(texto, True, cor)
+
+def estatisticas_texto():
+    return renderizar_texto.cache_info()
 
 def desenhar_texto(tela, texto, tamanho, x, y, cor=BRANCO, centralizado=True):
-    fonte = pygame.font.SysFont("Arial", tamanho, bold=True)
-    superficie = fonte.render(texto, True, cor)
+    superficie = renderizar_texto(texto, tamanho, tuple(cor))
     rect = superficie.get_rect()
     if centralizado:
         rect.center = (x,y)
     else:
         rect.topleft = (x,y)
-    tela.blit(superficie, rect)
+    return tela.blit(superficie, rect)
 
 def desenhar_moldura_3d(tela, x, y, largura, altura, cor_base):
     # Efeito 3D
@@ -200,27 +269,22 @@ class Botao:
         self.cor_hover = cor_hover
         self.clicado = False
 
-    def desenhar(self, tela):
+    def cor_atual(self):
         pos_mouse = pygame.mouse.get_pos()
-        cor_atual = self.cor_hover if self.rect.collidepoint(pos_mouse) else self.cor
-        
-        # Efeito de bloco 3D em toda a extensão do botão
-        # Se for maior que um bloco, desenhamos com a lógica de chanfro expandida
-        offset = TAM_BLOCO // 5
-        brilho = (min(cor_atual[0] + 80, 255), min(cor_atual[1] + 80, 255), min(cor_atual[2] + 80, 255))
-        sombra = (max(cor_atual[0] - 60, 0), max(cor_atual[1] - 60, 0), max(cor_atual[2] - 60, 0))
-
-        # Chanfros do botão retangular
-        pygame.draw.polygon(tela, brilho, [(self.rect.x, self.rect.y), (self.rect.right, self.rect.y), (self.rect.right - offset, self.rect.y + offset), (self.rect.x + offset, self.rect.y + offset)])
-        pygame.draw.polygon(tela, brilho, [(self.rect.x, self.rect.y), (self.rect.x + offset, self.rect.y + offset), (self.rect.x + offset, self.rect.bottom - offset), (self.rect.x, self.rect.bottom)])
-        pygame.draw.polygon(tela, sombra, [(self.rect.x, self.rect.bottom), (self.rect.x + offset, self.rect.bottom - offset), (self.rect.right - offset, self.rect.bottom - offset), (self.rect.right, self.rect.bottom)])
-        pygame.draw.polygon(tela, sombra, [(self.rect.right, self.rect.y), (self.rect.right - offset, self.rect.y + offset), (self.rect.right - offset, self.rect.bottom - offset), (self.rect.right, self.rect.bottom)])
+        return self.cor_hover if self.rect.collidepoint(pos_mouse) else self.cor
+
+    def assinatura(self):
+        # Tudo o que muda a aparência do botão (usado pelos retângulos sujos)
+        return (tuple(self.rect), self.texto, self.cor_atual())
+
+    def desenhar(self, tela):
+        cor_atual = self.cor_atual()
         
-        # Centro
-        pygame.draw.rect(tela, cor_atual, (self.rect.x + offset, self.rect.y + offset, self.rect.width - 2*offset, self.rect.height - 2*offset))
-        pygame.draw.rect(tela, (5, 5, 5), self.rect, 1) # Borda
+        # Efeito de bloco 3D em toda a extensão do botão (chanfro pré-renderizado no atlas)
+        tela.blit(obter_sprite(self.rect.width, self.rect.height, cor_atual), self.rect)
         
-        desenhar_texto(tela, self.texto, 24, self.rect.centerx, self.rect.centery, BRANCO)
+        texto_rect = desenhar_texto(tela, self.texto, 24, self.rect.centerx, self.rect.centery, BRANCO)
+        return self.rect.union(texto_rect)
 
     def checar_click(self, event):
         if event.type == pygame.MOUSEBUTTONDOWN:
@@ -228,74 +292,444 @@ class Botao:
                 return True
         return False
 
-def criar_superficie_fundo(largura_tela, altura_tela):
-    # Cria uma superfície persistente para o fundo para otimizar performance
-    superficie = pygame.Surface((largura_tela, altura_tela))
-    cor_fundo_base = (10, 10, 15)
-    superficie.fill(cor_fundo_base)
-    
-    cor_bloco = (20, 20, 22)
-    # Tiling por toda a tela
-    for y in range(0, altura_tela, TAM_BLOCO):
-        for x in range(0, largura_tela, TAM_BLOCO):
-            desenhar_bloco_cube(superficie, x, y, cor_bloco, fundo=True)
-            
-    return superficie
+# --- TABULEIRO GRANDE ---
+# O bloco encolhe (até TAM_BLOCO_MIN) para o tabuleiro caber na tela; se nem
+# assim couber, só uma janela de células é mostrada e ela rola seguindo a peça.
+# As peças fixas ficam em pedaços de PEDACO x PEDACO células, cada um com a sua
+# superfície em cache: fixar uma peça só refaz os pedaços que ela tocou, e um
+# pedaço fora da janela só é refeito quando volta a aparecer.
+TAM_BLOCO_MAX = TAM_BLOCO
+TAM_BLOCO_MIN = 6
+MARGEM = 50
+PEDACO = 16
+
+def tamanho_bloco(largura, altura):
+    # Maior bloco (até TAM_BLOCO_MAX) com que o tabuleiro inteiro cabe na tela
+    cabe = min((largura - 2*MARGEM) // COLS, (altura - 2*MARGEM) // LINHAS)
+    return max(TAM_BLOCO_MIN, min(TAM_BLOCO_MAX, cabe))
+
+def _rolar(inicio, pos, tamanho, visiveis, total):
+    # Primeira célula visível num eixo para a peça (pos, tamanho) ficar a pelo
+    # menos um quarto da janela da borda
+    folga = max(0, min(visiveis // 4, (visiveis - tamanho) // 2))
+    if pos - folga < inicio:
+        inicio = pos - folga
+    elif pos + tamanho + folga > inicio + visiveis:
+        inicio = pos + tamanho + folga - visiveis
+    return max(0, min(inicio, total - visiveis))
+
+# --- CAMADAS (COMPOSIÇÃO) ---
+# O quadro é montado a partir de três camadas:
+#  - estática: imagem de fundo, moldura, painel de vidro e rótulos do painel.
+#    Só é refeita quando o tamanho da tela ou o modo (fullscreen/janela) muda;
+#  - blocos: grade vazia + peças fixas na janela visível do tabuleiro, montada a
+#    partir dos pedaços e atualizada apenas quando uma peça é fixada, linhas são
+#    removidas ou a janela rola;
+#  - dinâmica: peça em queda, HUD e botões, desenhados a cada quadro.
+class Camadas:
+    def __init__(self):
+        self.estatica = None
+        self.blocos = None
+        self.chave = None
+        self.pedacos = {}  # (px, py) -> Surface; ausente = precisa ser refeito
+        # Pedaços refeitos que precisam ser copiados de novo para a janela
+        self.pendentes = set()
+        self.janela_suja = True
+        self.camera = (0, 0)  # primeira coluna e linha visíveis
+        self.visiveis_cols, self.visiveis_linhas = COLS, LINHAS
+        # Áreas da tela alteradas na camada de blocos desde o último quadro
+        self.alteracoes = []
+        self.reconstruida = False
+
+    def layout(self, largura, altura, fullscreen):
+        global TAM_BLOCO
+        TAM_BLOCO = tamanho_bloco(largura, altura)
+
+        # Painel lateral
+        painel_offset_x = 50 if not fullscreen else 150
+        largura_painel = 240
+        altura_painel = 420
+
+        # Janela do tabuleiro: inteiro se couber; senão o que sobra ao lado do painel
+        self.visiveis_cols = COLS
+        if COLS*TAM_BLOCO > largura - 2*MARGEM:
+            self.visiveis_cols = max(1, (largura - 2*MARGEM - painel_offset_x - largura_painel) // TAM_BLOCO)
+        self.visiveis_linhas = min(LINHAS, (altura - 2*MARGEM) // TAM_BLOCO)
+        largura_janela = self.visiveis_cols*TAM_BLOCO
+        altura_janela = self.visiveis_linhas*TAM_BLOCO
+
+        # Ajuste de layout baseado no modo
+        if fullscreen:
+            tabuleiro_x = max(MARGEM, min((largura - largura_janela)//2,
+                                          largura - MARGEM - painel_offset_x - largura_painel - largura_janela))
+            tabuleiro_y = (altura - altura_janela)//2
+        else:
+            tabuleiro_x = MARGEM
+            tabuleiro_y = MARGEM
+
+        painel_rect = pygame.Rect(
+            tabuleiro_x + largura_janela + painel_offset_x,
+            tabuleiro_y,
+            largura_painel,
+            altura_painel
+        )
+        return tabuleiro_x, tabuleiro_y, painel_rect
+
+    def invalidar(self):
+        # Força a reconstrução de todas as camadas no próximo quadro
+        self.chave = None
+
+    def preparar(self, imagem_fundo, largura, altura, fullscreen, grid, peca):
+        # imagem_fundo é None enquanto fundo.py ainda não escalou a imagem
+        chave = (largura, altura, fullscreen, imagem_fundo is None)
+        if chave != self.chave:
+            self.chave = chave
+            self.reconstruida = True
+            self.tabuleiro_x, self.tabuleiro_y, self.painel_rect = self.layout(largura, altura, fullscreen)
+            self._construir_estatica(imagem_fundo, largura, altura)
+            self.blocos = pygame.Surface(self.tabuleiro_rect().size).convert()
+            self.redesenhar_blocos()
+        self.seguir(peca)
+        self._atualizar_janela(grid)
+
+    def _construir_estatica(self, imagem_fundo, largura, altura):
+        estatica = pygame.Surface((largura, altura)).convert()
+        if imagem_fundo is None:
+            estatica.fill(COR_FALLBACK)
+        else:
+            estatica.blit(imagem_fundo, (0, 0))
+
+        # Moldura 3D ao redor do tabuleiro
+        rect = self.tabuleiro_rect()
+        desenhar_moldura_3d(estatica, rect.x-4, rect.y-4, rect.width+8, rect.height+8, (30,30,30))
+
+        # Desenhar fundo do painel lateral (preto transparente)
+        desenhar_vidro(estatica, self.painel_rect)
+
+        # Rótulos fixos do painel
+        centro_painel_x = self.painel_rect.centerx
+        elem_y = self.painel_rect.y + 20
+        desenhar_texto(estatica, "NEXT", 28, centro_painel_x, elem_y, centralizado=True)
+        desenhar_texto(estatica, "LEVEL", 24, centro_painel_x, elem_y + 140, centralizado=True)
+        desenhar_texto(estatica, "SCORE", 24, centro_painel_x, elem_y + 220, centralizado=True)
+        self.estatica = estatica
+
+    def redesenhar_blocos(self):
+        # Descarta todos os pedaços (novo jogo, jogo carregado, troca de tamanho)
+        self.pedacos.clear()
+        self.pendentes.clear()
+        self.janela_suja = True
+
+    def _sujar(self, px, py):
+        self.pedacos.pop((px, py), None)
+        self.pendentes.add((px, py))
+
+    def fixar(self, peca):
+        # Atualização incremental: só os pedaços das células da peça que acabou de ser fixada
+        for i, linha in enumerate(peca.forma):
+            for j, bloco in enumerate(linha):
+                if bloco:
+                    self._sujar((peca.x + j) // PEDACO, (peca.y + i) // PEDACO)
+
+    def remover_linhas(self, peca):
+        # Linhas removidas estão entre as que a peça tocou: tudo acima da última
+        # delas desceu e os pedaços até ali são refeitos
+        for py in range((peca.y + len(peca.forma) - 1) // PEDACO + 1):
+            for px in range((COLS - 1) // PEDACO + 1):
+                self._sujar(px, py)
+
+    def seguir(self, peca):
+        # Rola a janela do tabuleiro para manter a peça em queda visível
+        camera = (_rolar(self.camera[0], peca.x, len(peca.forma[0]), self.visiveis_cols, COLS),
+                  _rolar(self.camera[1], peca.y, len(peca.forma), self.visiveis_linhas, LINHAS))
+        if camera != self.camera:
+            self.camera = camera
+            self.janela_suja = True
+
+    def _pedaco(self, grid, px, py):
+        superficie = self.pedacos.get((px, py))
+        if superficie is None:
+            x0, y0 = px*PEDACO, py*PEDACO
+            linhas = [linha[x0:x0 + PEDACO] for linha in grid[y0:y0 + PEDACO]]
+            superficie = pygame.Surface((len(linhas[0])*TAM_BLOCO, len(linhas)*TAM_BLOCO)).convert()
+            desenhar_tabuleiro(superficie, linhas, 0, 0)
+            self.pedacos[(px, py)] = superficie
+        return superficie
+
+    def _copiar_pedaco(self, grid, px, py):
+        # Copia a parte visível do pedaço para a camada de blocos
+        destino = ((px*PEDACO - self.camera[0])*TAM_BLOCO, (py*PEDACO - self.camera[1])*TAM_BLOCO)
+        return self.blocos.blit(self._pedaco(grid, px, py), destino)
+
+    def _visivel(self, px, py):
+        cx, cy = self.camera
+        return (cx // PEDACO <= px <= (cx + self.visiveis_cols - 1) // PEDACO
+                and cy // PEDACO <= py <= (cy + self.visiveis_linhas - 1) // PEDACO)
+
+    def _atualizar_janela(self, grid):
+        if self.janela_suja:
+            cx, cy = self.camera
+            for py in range(cy // PEDACO, (cy + self.visiveis_linhas - 1) // PEDACO + 1):
+                for px in range(cx // PEDACO, (cx + self.visiveis_cols - 1) // PEDACO + 1):
+                    self._copiar_pedaco(grid, px, py)
+            self.alteracoes.append(self.tabuleiro_rect())
+            self.janela_suja = False
+        else:
+            # Pendentes fora da janela ficam sem superfície até voltarem a aparecer
+            for px, py in self.pendentes:
+                if self._visivel(px, py):
+                    area = self._copiar_pedaco(grid, px, py)
+                    self.alteracoes.append(area.move(self.tabuleiro_x, self.tabuleiro_y))
+        self.pendentes.clear()
+
+    def origem(self):
+        # Posição na tela da célula (0, 0) do tabuleiro (pode estar fora da janela)
+        return (self.tabuleiro_x - self.camera[0]*TAM_BLOCO,
+                self.tabuleiro_y - self.camera[1]*TAM_BLOCO)
+
+    def tabuleiro_rect(self):
+        return pygame.Rect(self.tabuleiro_x, self.tabuleiro_y,
+                           self.visiveis_cols*TAM_BLOCO, self.visiveis_linhas*TAM_BLOCO)
+
+    def desenhar(self, tela):
+        tela.blit(self.estatica, (0, 0))
+        tela.blit(self.blocos, (self.tabuleiro_x, self.tabuleiro_y))
+
+    def restaurar(self, tela, rect):
+        # Recompõe só um retângulo da tela a partir das camadas estática e de blocos
+        tela.blit(self.estatica, rect, rect)
+        area = rect.clip(self.tabuleiro_rect())
+        if area:
+            tela.blit(self.blocos, area, area.move(-self.tabuleiro_x, -self.tabuleiro_y))
+
+# --- RETÂNGULOS SUJOS ---
+# Em vez de enviar a tela inteira a cada quadro, só as regiões que mudaram vão
+# para pygame.display.update(rects). Cada elemento dinâmico é descrito por
+# (nome, assinatura, desenhar): se a assinatura muda, o retângulo antigo é
+# restaurado a partir das camadas e o elemento é redesenhado. A tela inteira
+# só é redesenhada quando as camadas são reconstruídas (resize/fullscreen),
+# quando o conjunto de elementos muda (overlays) ou quando há sobreposição.
+ATUALIZACAO_PARCIAL = True
+
+# Fase do perfil (perfil.py) em que o desenho de cada elemento é contabilizado
+FASE_ELEMENTO = {
+    "peca": "peca",
+    "fantasma": "peca",
+    "proxima": "hud",
+    "nivel": "hud",
+    "pontuacao": "hud",
+    "perfil": "hud",
+    "btn_pause": "botoes",
+    "btn_fechar": "botoes",
+    "btn_redimensionar": "botoes",
+}
+
+class RetangulosSujos:
+    def __init__(self, perfil=None):
+        self.elementos = {}  # nome -> (assinatura, rect)
+        self.tela_cheia = True
+        self.perfil = perfil if perfil is not None else Perfil()
+
+    def invalidar(self):
+        self.tela_cheia = True
+
+    def _desenhar(self, nome, desenhar):
+        with self.perfil.fase(FASE_ELEMENTO.get(nome, "overlay")):
+            return desenhar()
+
+    def _redesenhar_tudo(self, tela, camadas, elementos):
+        with self.perfil.fase("fundo"):
+            camadas.desenhar(tela)
+        camadas.alteracoes.clear()
+        self.elementos = {nome: (assinatura, self._desenhar(nome, desenhar)) for nome, assinatura, desenhar in elementos}
+        self.tela_cheia = False
+        with self.perfil.fase("display"):
+            pygame.display.update()
+
+    def quadro(self, tela, camadas, elementos):
+        nomes = [nome for nome, _, _ in elementos]
+        if (self.tela_cheia or not ATUALIZACAO_PARCIAL or camadas.reconstruida
+                or nomes != list(self.elementos)):
+            camadas.reconstruida = False
+            self._redesenhar_tudo(tela, camadas, elementos)
+            return
+
+        sujos = list(camadas.alteracoes)
+        camadas.alteracoes.clear()
+        redesenhar = set()
+        for nome, assinatura, _ in elementos:
+            if self.elementos[nome][0] != assinatura:
+                redesenhar.add(nome)
+                sujos.append(self.elementos[nome][1])
+
+        if not sujos:
+            return
+
+        # Elementos inalterados que encostam numa área suja também são redesenhados
+        # (o texto com antialiasing não pode ser desenhado duas vezes por cima)
+        expandiu = True
+        while expandiu:
+            expandiu = False
+            for nome in nomes:
+                rect = self.elementos[nome][1]
+                if nome not in redesenhar and rect.collidelist(sujos) != -1:
+                    redesenhar.add(nome)
+                    sujos.append(rect)
+                    expandiu = True
+
+        with self.perfil.fase("fundo"):
+            for rect in sujos:
+                camadas.restaurar(tela, rect)
+
+        for nome, assinatura, desenhar in elementos:
+            if nome in redesenhar:
+                rect = self._desenhar(nome, desenhar)
+                self.elementos[nome] = (assinatura, rect)
+                sujos.append(rect)
+
+        # O elemento pode ter crescido por cima de outro que não foi redesenhado
+        for nome in nomes:
+            if nome in redesenhar:
+                continue
+            if self.elementos[nome][1].collidelist(sujos) != -1:
+                self._redesenhar_tudo(tela, camadas, elementos)
+                return
+
+        with self.perfil.fase("display"):
+            pygame.display.update(sujos)
+
+# --- ELEMENTOS DO JOGO ---
+# Distância do topo do painel lateral ao primeiro elemento
+PADDING_PAINEL = 20
+
+def elementos_jogo(tela, camadas, jogo, botoes=()):
+    # Elementos dinâmicos do jogo em andamento, para RetangulosSujos.quadro():
+    # fantasma, peça, próxima peça, nível, pontuação e botoes [(nome, Botao)].
+    # Usado pelo loop de main() e por benchmark.py.
+    # Origem do tabuleiro na tela (desloca com a rolagem) e área visível
+    origem_x, origem_y = camadas.origem()
+    area_tabuleiro = camadas.tabuleiro_rect()
+    centro_painel_x = camadas.painel_rect.centerx
+    elem_y = camadas.painel_rect.y + PADDING_PAINEL
+    forma = tuple(map(tuple, jogo.peca.forma))
+    y_fantasma = jogo.fantasma()
+    elementos = [
+        ("fantasma", (jogo.peca.x, y_fantasma, forma, jogo.peca.cor, camadas.camera),
+         lambda: desenhar_recortado(tela, area_tabuleiro, desenhar_fantasma, jogo.peca, y_fantasma, origem_x, origem_y)),
+        ("peca", (jogo.peca.x, jogo.peca.y, forma, jogo.peca.cor, camadas.camera),
+         lambda: desenhar_recortado(tela, area_tabuleiro, desenhar_peca, jogo.peca, origem_x, origem_y)),
+        ("proxima", (tuple(map(tuple, jogo.proxima.forma)), jogo.proxima.cor),
+         lambda: desenhar_proxima_peca(tela, jogo.proxima, centro_painel_x, elem_y + 40)),
+        # Pontuação e Nível
+        ("nivel", jogo.nivel,
+         lambda: desenhar_texto(tela, str(jogo.nivel), 32, centro_painel_x, elem_y + 175, centralizado=True, cor=(0, 255, 255))),
+        ("pontuacao", jogo.pontuacao,
+         lambda: desenhar_texto(tela, str(jogo.pontuacao), 32, centro_painel_x, elem_y + 255, centralizado=True, cor=(255,215,0))),
+    ]
+    elementos += [(nome, botao.assinatura(), lambda botao=botao: botao.desenhar(tela)) for nome, botao in botoes]
+    return elementos
+
+# --- MODO OCIOSO ---
+# Pausado, no menu inicial ou no game over nada muda sozinho: depois de desenhar
+# um quadro, o loop dorme até chegar um evento (mouse, teclado, resize, timer) e
+# só então recompõe a cena (o hover dos botões chega como MOUSEMOTION).
+# pygame.event.wait() não serve: no pygame 2 ele faz polling a cada 1 ms; a
+# espera é feita em fatias de clock.tick(FPS_OCIOSO).
+# Minimizada ou sem foco, a janela continua jogando com um limite de FPS menor.
+MODO_OCIOSO = True
+FPS_OCIOSO = 20
+FPS_ATIVO = 60
+FPS_SEM_FOCO = 20
+FPS_MINIMIZADO = 5
+
+# --- LOOP PRINCIPAL ---
+# Cada quadro: espera, entrada, lógica, desenho. A entrada é lida logo antes de
+# desenhar, então uma tecla aparece no mesmo quadro em que foi lida. A lógica
+# (gravidade e DAS/ARR de entrada.py) roda em passos fixos de PASSO_LOGICA_MS
+# acumulados a partir do tempo real, e não depende da taxa de quadros.
+PASSO_LOGICA_MS = 5
+MAX_PASSOS_QUADRO = 50
+
+# Teclas -> ações do núcleo
+TECLAS = {
+    pygame.K_LEFT: ESQUERDA,
+    pygame.K_RIGHT: DIREITA,
+    pygame.K_DOWN: BAIXO,
+    pygame.K_UP: GIRAR,
+    pygame.K_SPACE: QUEDA,
+}
 
 # --- MAIN ---
-def main():
+def iniciar_pygame():
+    # Só os módulos usados: pygame.init() também abriria áudio e joystick
+    pygame.display.init()
+    pygame.font.init()
+
+def main(pasta_save=None, medir_inicio=False):
+    # medir_inicio: sai assim que fontes e fundo aparecem na tela (--inicio)
     global TELA, LARGURA, ALTURA, MODO_FULLSCREEN
-    import json
-    diretorio_atual = os.path.dirname(os.path.abspath(__file__))
-    caminho_save = os.path.join(diretorio_atual, "savegame.json")
-
-    def salvar_jogo(grid, score, level, lines, next_peca):
-        estado = {
-            "grid": grid,
-            "score": score,
-            "level": level,
-            "lines": lines,
-            "next_peca": FORMAS.index(next_peca.forma)
-        }
-        with open(caminho_save, "w") as f:
-            json.dump(estado, f)
+    inicio = Inicio(INICIO_IMPORT, ARQUIVO_INICIO)
+    inicio.marcar("import", FIM_IMPORT)
+    iniciar_pygame()
+    buscar_fontes()
+
+    # Configuração inicial do display
+    pygame.display.set_caption("Tetris Cube")
+    TELA = pygame.display.set_mode((0, 0), pygame.FULLSCREEN)
+    LARGURA, ALTURA = TELA.get_size()
+    MODO_FULLSCREEN = True
+    inicio.marcar("init")
+
+    # Save de versões anteriores: savegame.json ao lado do script, só leitura
+    # (quem passa pasta_save, como o benchmark, não quer o save do jogador)
+    caminho_save_legado = None
+    if pasta_save is None:
+        caminho_save_legado = os.path.join(os.path.dirname(os.path.abspath(__file__)), "savegame.json")
+    # Save e placar na pasta de dados do usuário (TETRIS_DADOS ou $XDG_DATA_HOME/tetris-cube)
+    pasta_save = pasta_save or salvamento.pasta_dados_padrao()
+    try:
+        os.makedirs(pasta_save, exist_ok=True)
+    except OSError as erro:
+        salvamento.avisar(f"não foi possível criar {pasta_save}: {erro}")
+    caminho_save = os.path.join(pasta_save, "savegame.sav")
+    # Marca que o save legado já foi descartado quando não deu para apagá-lo
+    marca_legado = os.path.join(pasta_save, "legado_descartado")
+    if os.path.exists(marca_legado):
+        caminho_save_legado = None
+    autosave = salvamento.Autosave(caminho_save)
+    # Placar SQLite gravado em segundo plano; o evento acorda o loop (modo
+    # ocioso) para o game over mostrar o top atualizado
+    placar = Placar(os.path.join(pasta_save, "placar.db"),
+                    ao_atualizar=lambda: _postar_evento(PLACAR_ATUALIZADO))
 
     def carregar_jogo():
-        if os.path.exists(caminho_save):
+        return salvamento.carregar(caminho_save, caminho_save_legado)
+
+    def apagar_save():
+        nonlocal caminho_save_legado
+        autosave.cancelar()
+        salvamento.apagar(caminho_save, caminho_save_legado)
+        if caminho_save_legado and os.path.exists(caminho_save_legado):
             try:
-                with open(caminho_save, "r") as f:
-                    return json.load(f)
-            except:
-                return None
-        return None
+                open(marca_legado, "w").close()
+            except OSError:
+                pass
+        caminho_save_legado = None
 
     clock = pygame.time.Clock()
-    grid = criar_grid()
-    peca = Peca(COLS//2-1, 0, random.choice(FORMAS))
-    proxima = Peca(0,0, random.choice(FORMAS))
-    pontuacao = 0
-    nivel = 1
-    linhas_totais = 0
+    jogo = Jogo(random.Random())
     menu_inicial = carregar_jogo() is not None
     
-    game_over = False
     pausado = False
+    focado = True
+    minimizado = False
 
-    # Carrega imagem de fundo
-    def carregar_e_ajustar_fundo():
-        diretorio_atual = os.path.dirname(os.path.abspath(__file__))
-        caminho_img = os.path.join(diretorio_atual, "img", "bg.jpg")
-        try:
-            if os.path.exists(caminho_img):
-                img = pygame.image.load(caminho_img).convert()
-                return pygame.transform.scale(img, (LARGURA, ALTURA))
-        except:
-            pass
-        fallback = pygame.Surface((LARGURA, ALTURA))
-        fallback.fill((10, 10, 15))
-        return fallback
-
-    imagem_fundo = carregar_e_ajustar_fundo()
+    # Imagem de fundo: carregada e escalada em segundo plano (fundo.py). A
+    # variante do outro modo de tela já é pedida para a troca não esperar.
+    diretorio_atual = os.path.dirname(os.path.abspath(__file__))
+    fundos = CacheFundo(os.path.join(diretorio_atual, "img", "bg.jpg"))
+    fundos.preparar((LARGURA, ALTURA))
+    fundos.preparar((LARGURA_JANELA, ALTURA_JANELA))
 
     # Botões de controle
     btn_fechar = Botao(LARGURA - 50, 10, 40, 40, "X", (200, 50, 50), (255, 80, 80))
@@ -311,139 +745,140 @@ def main():
     btn_continuar = Botao(0, 0, 200, 50, "CONTINUE", (50, 150, 50), (70, 200, 70))
     btn_novo_jogo = Botao(0, 0, 200, 50, "NEW GAME", (150, 100, 50), (200, 130, 70))
 
+    camadas = Camadas()
+    perfil = Perfil(ARQUIVO_PERFIL)
+    sujos = RetangulosSujos(perfil)
+
+    gravador = None
+
+    def zerar_partida():
+        # Tempo jogado e peças para o placar (partida continuada conta daqui)
+        nonlocal tempo_partida, pecas_partida, bot_na_partida
+        tempo_partida = 0
+        pecas_partida = 0
+        bot_na_partida = bot is not None
+
+    def iniciar_partida():
+        # Nova partida, gravada se PASTA_REPLAYS estiver definida
+        nonlocal gravador
+        parar_gravacao()
+        zerar_partida()
+        if PASTA_REPLAYS:
+            gravador = nova_partida_gravada(jogo, PASTA_REPLAYS)
+        else:
+            jogo.reiniciar()
+
+    def parar_gravacao():
+        nonlocal gravador
+        if gravador is not None:
+            gravador.fechar()
+            gravador = None
+
     def reset_jogo():
-        nonlocal grid, peca, proxima, pontuacao, nivel, linhas_totais, queda_velocidade, game_over, pausado, menu_inicial
-        grid = criar_grid()
-        peca = Peca(COLS//2-1, 0, random.choice(FORMAS))
-        proxima = Peca(0,0, random.choice(FORMAS))
-        pontuacao = 0
-        nivel = 1
-        linhas_totais = 0
-        queda_velocidade = 500
-        game_over = False
+        nonlocal gravidade, pausado, menu_inicial
+        iniciar_partida()
+        gravidade = 0
         pausado = False
         menu_inicial = False
-        if os.path.exists(caminho_save):
-            os.remove(caminho_save)
-        pygame.time.set_timer(pygame.USEREVENT, queda_velocidade)
+        camadas.redesenhar_blocos()
+        apagar_save()
 
     def continuar_jogo():
-        nonlocal grid, peca, proxima, pontuacao, nivel, linhas_totais, queda_velocidade, menu_inicial
+        nonlocal gravidade, menu_inicial
         dados = carregar_jogo()
         if dados:
-            grid = dados["grid"]
-            pontuacao = dados["score"]
-            nivel = dados["level"]
-            linhas_totais = dados["lines"]
-            proxima = Peca(0, 0, FORMAS[dados["next_peca"]])
-            peca = Peca(COLS//2-1, 0, random.choice(FORMAS))
-            queda_velocidade = max(100, 500 - (nivel - 1) * 50)
-            pygame.time.set_timer(pygame.USEREVENT, queda_velocidade)
+            # Partida continuada não é gravada: o replay precisa começar do zero
+            parar_gravacao()
+            jogo.carregar(dados)
+            zerar_partida()
+            gravidade = 0
             menu_inicial = False
+            camadas.redesenhar_blocos()
 
-    queda_velocidade = 500
-    pygame.time.set_timer(pygame.USEREVENT, queda_velocidade)
+    def passo(acao):
+        # jogo.step cronometrado: o step que fixa a peça (colisao, fixar_peca e
+        # remover_linhas) conta na fase "travar", os outros em "logica"
+        inicio_step = time.perf_counter()
+        linhas_removidas = jogo.step(acao)
+        perfil.adicionar("travar" if jogo.fixada is not None else "logica", time.perf_counter() - inicio_step)
+        return linhas_removidas
 
-    rodando = True
-    while rodando:
-        TELA.blit(imagem_fundo, (0, 0))
-
-        # Ajuste de layout baseado no modo
-        if MODO_FULLSCREEN:
-            tabuleiro_x = (LARGURA - COLS*TAM_BLOCO)//2
-            tabuleiro_y = (ALTURA - LINHAS*TAM_BLOCO)//2
-            btn_fechar.rect.x = LARGURA - 50
-            btn_redimensionar.rect.x = LARGURA - 100
+    def apos_travar(linhas_removidas):
+        # Atualiza camadas, save e placar depois que uma peça foi fixada
+        nonlocal pecas_partida
+        pecas_partida += 1
+        with perfil.fase("tabuleiro"):
+            camadas.fixar(jogo.fixada)
+            if linhas_removidas > 0:
+                camadas.remover_linhas(jogo.fixada)
+        if jogo.game_over:
+            parar_gravacao()
+            apagar_save()
+            # Partidas em que o bot jogou ficam com o nome "bot"
+            placar.registrar("bot" if bot_na_partida else JOGADOR, jogo.pontuacao, jogo.nivel,
+                             jogo.linhas_totais, tempo_partida / 1000, pecas_partida)
         else:
-            tabuleiro_x = 50
-            tabuleiro_y = 50
-            btn_fechar.rect.x = LARGURA - 50
-            btn_redimensionar.rect.x = LARGURA - 100
+            # Autosave em segundo plano a cada peça travada
+            autosave.agendar(jogo)
 
-        # Moldura 3D ao redor do tabuleiro
-        desenhar_moldura_3d(TELA, tabuleiro_x-4, tabuleiro_y-4, COLS*TAM_BLOCO+8, LINHAS*TAM_BLOCO+8, (30,30,30))
-
-        # Desenhar grid e peça atual
-        desenhar_tabuleiro(TELA, grid, tabuleiro_x, tabuleiro_y)
-        desenhar_peca(TELA, peca, tabuleiro_x, tabuleiro_y)
-
-        # Painel lateral
-        painel_offset_x = 50 if not MODO_FULLSCREEN else 150
-        padding = 20
-        largura_painel = 240
-        altura_painel = 420
-        
-        painel_rect = pygame.Rect(
-            tabuleiro_x + COLS*TAM_BLOCO + painel_offset_x,
-            tabuleiro_y,
-            largura_painel,
-            altura_painel
-        )
-        
-        # Desenhar fundo do painel lateral (preto transparente)
-        desenhar_vidro(TELA, painel_rect)
+    # Jogador automático (tecla B)
+    bot = None
 
-        # Elementos dentro do painel (centralizados)
-        centro_painel_x = painel_rect.centerx
-        elem_y = painel_rect.y + padding
+    # Estatísticas da partida para o placar (ver zerar_partida)
+    tempo_partida = pecas_partida = 0
+    bot_na_partida = False
 
-        # Próxima peça
-        desenhar_texto(TELA, "NEXT", 28, centro_painel_x, elem_y, centralizado=True)
-        desenhar_proxima_peca(TELA, proxima, centro_painel_x, elem_y + 40)
+    if not menu_inicial:
+        iniciar_partida()
 
-        # Pontuação e Nível
-        desenhar_texto(TELA, "LEVEL", 24, centro_painel_x, elem_y + 140, centralizado=True)
-        desenhar_texto(TELA, str(nivel), 32, centro_painel_x, elem_y + 175, centralizado=True, cor=(0, 255, 255))
-        
-        desenhar_texto(TELA, "SCORE", 24, centro_painel_x, elem_y + 220, centralizado=True)
-        desenhar_texto(TELA, str(pontuacao), 32, centro_painel_x, elem_y + 255, centralizado=True, cor=(255,215,0))
-
-        # Posicionar e desenhar botão de Pause (centralizado)
-        btn_pause.rect.centerx = centro_painel_x
-        btn_pause.rect.y = elem_y + 340
-        btn_pause.texto = "PLAY" if pausado else "PAUSE"
-        
-        # Cores solicitadas: Verde para Play (quando pausado) e Vermelho para Pause (quando jogando)
-        cor_base = (50, 200, 50) if pausado else (200, 50, 50)
-        btn_pause.cor = cor_base
-        btn_pause.cor_hover = (min(cor_base[0]+30, 255), min(cor_base[1]+30, 255), min(cor_base[2]+30, 255))
-        btn_pause.desenhar(TELA)
+    # Lógica em passo fixo (ms acumulados) e gravidade (ms desde a última queda)
+    acumulador = 0
+    gravidade = 0
+    repeticao = Repeticao()
 
-        # Desenhar botões de controle
-        btn_fechar.desenhar(TELA)
-        btn_redimensionar.desenhar(TELA)
+    # Fontes do sistema já em uso (relatório de inicialização)
+    fontes_na_tela = _fontes_prontas.is_set()
 
-        # Overlay de Game Over
-        if game_over:
-            overlay_rect = pygame.Rect(LARGURA//2 - 150, ALTURA//2 - 100, 300, 200)
-            desenhar_vidro(TELA, overlay_rect, cor=(30, 0, 0), alpha=220)
-            desenhar_texto(TELA, "GAME OVER", 48, overlay_rect.centerx, overlay_rect.y + 40, cor=(255, 50, 50))
-            desenhar_texto(TELA, f"Score: {pontuacao}", 24, overlay_rect.centerx, overlay_rect.y + 90)
-            
-            btn_restart.rect.centerx = overlay_rect.centerx
-            btn_restart.rect.y = overlay_rect.y + 130
-            btn_restart.desenhar(TELA)
-
-        # Menu Inicial (Overlay)
-        if menu_inicial:
-            menu_rect = pygame.Rect(LARGURA//2 - 200, ALTURA//2 - 120, 400, 240)
-            desenhar_vidro(TELA, menu_rect, alpha=240)
-            desenhar_texto(TELA, "TETRIS CUBE", 48, menu_rect.centerx, menu_rect.y + 40, cor=(255, 255, 255))
-            
-            btn_continuar.rect.centerx = menu_rect.centerx
-            btn_continuar.rect.y = menu_rect.y + 100
-            btn_continuar.desenhar(TELA)
-            
-            btn_novo_jogo.rect.centerx = menu_rect.centerx
-            btn_novo_jogo.rect.y = menu_rect.y + 165
-            btn_novo_jogo.desenhar(TELA)
+    rodando = True
+    while rodando:
+        perfil.iniciar_quadro()
 
-        pygame.display.update()
-        clock.tick(60)
+        # 1) Espera pelo próximo quadro (ou, ocioso, pelo próximo evento)
+        eventos = []
+        with perfil.esperando():
+            if MODO_OCIOSO and (pausado or menu_inicial or jogo.game_over) and not sujos.tela_cheia:
+                while not eventos:
+                    dt = clock.tick(FPS_OCIOSO)
+                    eventos = pygame.event.get()
+                    perfil.coletou(eventos)
+            elif minimizado:
+                dt = clock.tick(FPS_MINIMIZADO)
+            else:
+                dt = clock.tick(FPS_ATIVO if focado else FPS_SEM_FOCO)
 
-        for event in pygame.event.get():
+        # 2) Entrada: processada antes de desenhar, aparece já neste quadro
+        with perfil.fase("eventos"):
+            novos = pygame.event.get()
+            perfil.coletou(novos)
+            eventos += novos
+        for event in eventos:
             if event.type == pygame.QUIT:
                 rodando = False
+            elif event.type == pygame.WINDOWFOCUSLOST:
+                focado = False
+                repeticao.limpar()
+            elif event.type == pygame.WINDOWFOCUSGAINED:
+                focado = True
+            elif event.type == pygame.WINDOWMINIMIZED:
+                minimizado = True
+            elif event.type == pygame.WINDOWRESTORED:
+                minimizado = False
+            elif event.type == FONTES_PRONTAS:
+                # Troca a fonte provisória pela do sistema: textos e camadas refeitos
+                obter_fonte.cache_clear()
+                renderizar_texto.cache_clear()
+                camadas.invalidar()
+                fontes_na_tela = True
             
             # Checar cliques nos botões
             if btn_fechar.checar_click(event):
@@ -457,7 +892,9 @@ def main():
                     TELA = pygame.display.set_mode((LARGURA_JANELA, ALTURA_JANELA))
                 
                 LARGURA, ALTURA = TELA.get_size()
-                imagem_fundo = carregar_e_ajustar_fundo()
+                limpar_atlas()
+                camadas.invalidar()
+                sujos.invalidar()
                 # Atualiza posição dos botões para o novo tamanho
                 btn_fechar.rect.x = LARGURA - 50
                 btn_redimensionar.rect.x = LARGURA - 100
@@ -471,54 +908,230 @@ def main():
 
             if btn_pause.checar_click(event):
                 pausado = not pausado
+                repeticao.limpar()
 
-            if game_over and btn_restart.checar_click(event):
+            if jogo.game_over and btn_restart.checar_click(event):
                 reset_jogo()
 
-            elif event.type == pygame.USEREVENT:
-                if not pausado and not game_over and not menu_inicial:
-                    if not colisao(peca, grid, dy=1):
-                        peca.y += 1
-                    else:
-                        fixar_peca(peca, grid)
-                        linhas_removidas = remover_linhas(grid)
-                        if linhas_removidas > 0:
-                            linhas_totais += linhas_removidas
-                            pontuacao += linhas_removidas * 100 * nivel
-                            # Lógica de Nível (fase)
-                            novo_nivel = (linhas_totais // 10) + 1
-                            if novo_nivel > nivel:
-                                nivel = novo_nivel
-                                queda_velocidade = max(100, 500 - (nivel - 1) * 50)
-                                pygame.time.set_timer(pygame.USEREVENT, queda_velocidade)
-
-                        peca = proxima
-                        proxima = Peca(0,0,random.choice(FORMAS))
-                        if colisao(peca, grid):
-                            game_over = True
-                            if os.path.exists(caminho_save):
-                                os.remove(caminho_save)
             elif event.type == pygame.KEYDOWN:
-                if not pausado and not game_over and not menu_inicial:
-                    if event.key == pygame.K_LEFT and not colisao(peca, grid, dx=-1):
-                        peca.x -= 1
-                    elif event.key == pygame.K_RIGHT and not colisao(peca, grid, dx=1):
-                        peca.x += 1
-                    elif event.key == pygame.K_DOWN and not colisao(peca, grid, dy=1):
-                        peca.y += 1
-                    elif event.key == pygame.K_UP:
-                        rotacionar(peca)
-                        if colisao(peca, grid):
-                            # desfaz rotação
-                            rotacionar(peca)
-                            rotacionar(peca)
-                            rotacionar(peca)
+                if event.key == pygame.K_F3:
+                    perfil.alternar_overlay()
+                elif event.key == pygame.K_p and not jogo.game_over:
+                    pausado = not pausado
+                    repeticao.limpar()
+                elif event.key == pygame.K_b and not menu_inicial:
+                    # Liga/desliga o modo bot (importado só quando usado); previsão
+                    # e processos vêm de TETRIS_BOT_PREVISAO/TETRIS_BOT_TRABALHADORES
+                    if bot is not None:
+                        bot.fechar()
+                        bot = None
+                    else:
+                        from bot import Bot
+                        bot = Bot()
+                    bot_na_partida = bot_na_partida or bot is not None
+                elif not pausado and not jogo.game_over and not menu_inicial:
+                    acao = TECLAS.get(event.key, NADA)
+                    if acao != NADA:
+                        linhas_removidas = passo(acao)
+                        if jogo.fixada is not None:
+                            # Queda (espaço) trava a peça
+                            apos_travar(linhas_removidas)
+                        repeticao.pressionar(acao)
+                        perfil.marcar_entrada()
+            elif event.type == pygame.KEYUP:
+                repeticao.soltar(TECLAS.get(event.key, NADA))
+
+        # 3) Lógica em passo fixo: gravidade e repetição de teclas avançam em
+        # passos de PASSO_LOGICA_MS, independentes da taxa de quadros
+        if not (pausado or jogo.game_over or menu_inicial):
+            # Tempo jogado, sem pausas (placar)
+            tempo_partida += dt
+        if pausado or jogo.game_over or menu_inicial:
+            acumulador = 0
+        elif bot is not None:
+            # Modo bot: uma peça posicionada e travada por quadro
+            acumulador = 0
+            # O planejamento conta em "logica"; os steps, pelo passo()
+            with perfil.fase("logica"):
+                linhas_removidas = bot.jogar(jogo, passo)
+            apos_travar(linhas_removidas)
+        else:
+            acumulador += dt
+            passos = 0
+            while acumulador >= PASSO_LOGICA_MS and not jogo.game_over:
+                acumulador -= PASSO_LOGICA_MS
+                passos += 1
+                if passos > MAX_PASSOS_QUADRO:
+                    # Travou por muito tempo (arrastando a janela, disco lento...):
+                    # descarta o atraso em vez de simular tudo de uma vez
+                    acumulador = 0
+                    break
+                acoes = repeticao.avancar(PASSO_LOGICA_MS)
+                if acoes:
+                    with perfil.fase("logica"):
+                        for acao in acoes:
+                            jogo.step(acao)
+                    perfil.marcar_entrada(repeticao=True)
+                gravidade += PASSO_LOGICA_MS
+                if gravidade >= jogo.velocidade_queda():
+                    gravidade -= jogo.velocidade_queda()
+                    linhas_removidas = passo(GRAVIDADE)
+                    if jogo.fixada is not None:
+                        apos_travar(linhas_removidas)
+
+
+        # 4) Desenho
+        # Camadas estática e de blocos (reconstruídas só quando necessário)
+        with perfil.fase("fundo"):
+            camadas.preparar(fundos.obter(LARGURA, ALTURA), LARGURA, ALTURA, MODO_FULLSCREEN, jogo.grid, jogo.peca)
+        painel_rect = camadas.painel_rect
+        btn_fechar.rect.x = LARGURA - 50
+        btn_redimensionar.rect.x = LARGURA - 100
+
+        # Elementos dentro do painel (centralizados)
+        centro_painel_x = painel_rect.centerx
+        elem_y = painel_rect.y + PADDING_PAINEL
+
+        # Posicionar botão de Pause (centralizado)
+        btn_pause.rect.centerx = centro_painel_x
+        btn_pause.rect.y = elem_y + 340
+        btn_pause.texto = "PLAY" if pausado else "PAUSE"
+        
+        # Cores solicitadas: Verde para Play (quando pausado) e Vermelho para Pause (quando jogando)
+        cor_base = (50, 200, 50) if pausado else (200, 50, 50)
+        btn_pause.cor = cor_base
+        btn_pause.cor_hover = (min(cor_base[0]+30, 255), min(cor_base[1]+30, 255), min(cor_base[2]+30, 255))
+
+        # Camada dinâmica: peça atual, próxima peça, HUD e botões
+        elementos = elementos_jogo(TELA, camadas, jogo, [
+            ("btn_pause", btn_pause),
+            # Botões de controle
+            ("btn_fechar", btn_fechar),
+            ("btn_redimensionar", btn_redimensionar),
+        ])
+
+        # Overlay de perfil (F3)
+        if perfil.overlay:
+            atual, media, p99 = perfil.resumo()
+            entrada_media, entrada_p99, entrada_quadros = perfil.resumo_entrada()
+            fps = clock.get_fps()
+
+            def desenhar_perfil():
+                perfil_rect = pygame.Rect(10, 10, 300, 84)
+                rects = [
+                    desenhar_vidro(TELA, perfil_rect, alpha=200),
+                    desenhar_texto(TELA, f"frame {atual:.1f} ms  avg {media:.1f}  p99 {p99:.1f}", 16,
+                                   perfil_rect.x + 10, perfil_rect.y + 10, centralizado=False),
+                    desenhar_texto(TELA, f"FPS {fps:.0f}", 16, perfil_rect.x + 10, perfil_rect.y + 34, centralizado=False),
+                    desenhar_texto(TELA, f"input {entrada_media:.1f} ms  p99 {entrada_p99:.1f}  {entrada_quadros:.1f} frames", 16,
+                                   perfil_rect.x + 10, perfil_rect.y + 58, centralizado=False),
+                ]
+                return perfil_rect.unionall(rects)
+
+            assinatura = tuple(round(v, 1) for v in (atual, media, p99, fps, entrada_media, entrada_p99, entrada_quadros))
+            elementos.append(("perfil", assinatura, desenhar_perfil))
+
+        # Overlay de Game Over
+        if jogo.game_over:
+            # Top do placar: lido do cache em memória, sem consultar o banco
+            melhores = placar.melhores()
+            altura_top = 40 + 26*len(melhores) if melhores else 0
+            overlay_rect = pygame.Rect(LARGURA//2 - 150, ALTURA//2 - 100 - altura_top//2, 300, 200 + altura_top)
+            btn_restart.rect.centerx = overlay_rect.centerx
+            btn_restart.rect.y = overlay_rect.y + 130 + altura_top
+
+            def desenhar_game_over():
+                rects = [
+                    desenhar_vidro(TELA, overlay_rect, cor=(30, 0, 0), alpha=220),
+                    desenhar_texto(TELA, "GAME OVER", 48, overlay_rect.centerx, overlay_rect.y + 40, cor=(255, 50, 50)),
+                    desenhar_texto(TELA, f"Score: {jogo.pontuacao}", 24, overlay_rect.centerx, overlay_rect.y + 90),
+                    btn_restart.desenhar(TELA),
+                ]
+                if melhores:
+                    rects.append(desenhar_texto(TELA, "TOP SCORES", 20, overlay_rect.centerx, overlay_rect.y + 130, cor=(255, 215, 0)))
+                    for i, (nome, pontos, _nivel, _linhas) in enumerate(melhores):
+                        y = overlay_rect.y + 158 + 26*i
+                        rects.append(desenhar_texto(TELA, f"{i + 1}. {nome[:12]}", 20, overlay_rect.x + 30, y - 10, centralizado=False))
+                        texto = renderizar_texto(str(pontos), 20)
+                        rects.append(TELA.blit(texto, texto.get_rect(topright=(overlay_rect.right - 30, y - 10))))
+                return overlay_rect.unionall(rects)
+
+            elementos.append(("game_over", (jogo.pontuacao, placar.versao, btn_restart.assinatura()), desenhar_game_over))
+
+        # Menu Inicial (Overlay)
+        if menu_inicial:
+            menu_rect = pygame.Rect(LARGURA//2 - 200, ALTURA//2 - 120, 400, 240)
+            btn_continuar.rect.centerx = menu_rect.centerx
+            btn_continuar.rect.y = menu_rect.y + 100
+            btn_novo_jogo.rect.centerx = menu_rect.centerx
+            btn_novo_jogo.rect.y = menu_rect.y + 165
+
+            def desenhar_menu():
+                rects = [
+                    desenhar_vidro(TELA, menu_rect, alpha=240),
+                    desenhar_texto(TELA, "TETRIS CUBE", 48, menu_rect.centerx, menu_rect.y + 40, cor=(255, 255, 255)),
+                    btn_continuar.desenhar(TELA),
+                    btn_novo_jogo.desenhar(TELA),
+                ]
+                return menu_rect.unionall(rects)
+
+            elementos.append(("menu", (btn_continuar.assinatura(), btn_novo_jogo.assinatura()), desenhar_menu))
+
+        sujos.quadro(TELA, camadas, elementos)
+        if not inicio.completo():
+            inicio.marcar("primeiro_quadro")
+            if fontes_na_tela and fundos.pronto(LARGURA, ALTURA):
+                inicio.marcar("carregado")
+                if medir_inicio:
+                    rodando = False
+
+        perfil.encerrar_quadro()
     
-    # Salva ao fechar
-    if not game_over and not menu_inicial:
-        salvar_jogo(grid, pontuacao, nivel, linhas_totais, proxima)
+    # Salva ao fechar e espera a escrita terminar
+    if not jogo.game_over and not menu_inicial:
+        autosave.agendar(jogo)
+    autosave.fechar()
+    placar.fechar()
+    parar_gravacao()
+    if bot is not None:
+        bot.fechar()
+    perfil.fechar()
+    fundos.fechar()
+    if medir_inicio:
+        print(inicio.resumo())
     
     pygame.quit()
+    # Fontes e superfícies em cache não valem depois de pygame.quit()
+    # (o benchmark chama main() mais de uma vez no mesmo processo)
+    obter_fonte.cache_clear()
+    renderizar_texto.cache_clear()
+    limpar_atlas()
+
+# --- BENCHMARK DE CPU ---
+# python main.py --cpu SEGUNDOS: roda o jogo pausado (tecla P) com e sem o modo
+# ocioso e mostra quanto de CPU o processo usou por segundo de relógio
+def _benchmark_cpu(segundos):
+    import tempfile
+    global MODO_OCIOSO
+    for ocioso in (False, True):
+        MODO_OCIOSO = ocioso
+        iniciar_pygame()
+        pygame.event.post(pygame.event.Event(pygame.KEYDOWN, key=pygame.K_p, mod=0, unicode="p", scancode=0))
+        pygame.time.set_timer(pygame.QUIT, int(segundos * 1000), loops=1)
+        cpu, inicio = time.process_time(), time.perf_counter()
+        # Save numa pasta temporária para não mexer no do jogador
+        with tempfile.TemporaryDirectory() as pasta:
+            main(pasta)
+        cpu, tempo = time.process_time() - cpu, time.perf_counter() - inicio
+        print(f"modo ocioso {'ligado ' if ocioso else 'desligado'}: {cpu:.2f}s de CPU em {tempo:.1f}s ({100 * cpu / tempo:.0f}% de um núcleo)")
 
 if __name__ == "__main__":
-    main()
+    import argparse
+    parser = argparse.ArgumentParser(description="Tetris Cube")
+    parser.add_argument("--cpu", type=float, metavar="SEGUNDOS", help="mede o uso de CPU pausado, com e sem o modo ocioso")
+    parser.add_argument("--inicio", action="store_true", help="abre o jogo, mostra os tempos de inicialização e sai")
+    a = parser.parse_args()
+    if a.cpu:
+        _benchmark_cpu(a.cpu)
+    else:
+        main(medir_inicio=a.inicio)
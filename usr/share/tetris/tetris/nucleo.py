@@ -0,0 +1,353 @@
+import os
+import random
+
+# --- NÚCLEO DO JOGO ---
+# Regras do Tetris em Python puro, sem pygame: pode ser importado por testes,
+# bots e servidores sem abrir janela. A interface gráfica fica em main.py.
+
+# --- CONFIGURAÇÕES ---
+# Tamanho do tabuleiro: TETRIS_TABULEIRO="LARGURAxALTURA" (ex.: 100x400) liga o
+# modo de tabuleiro grande; main.py reduz o bloco e rola a visão para caber na tela
+def _tamanho_tabuleiro(texto):
+    cols, linhas = (int(n) for n in texto.lower().split("x"))
+    if cols < 4 or linhas < 4:
+        raise ValueError(f"tabuleiro {texto}: mínimo 4x4")
+    return cols, linhas
+
+COLS, LINHAS = _tamanho_tabuleiro(os.environ.get("TETRIS_TABULEIRO", "10x20"))
+
+CORES = [
+    (0, 160, 255),    # Azul Ciano
+    (255, 210, 10),   # Amarelo Ouro
+    (50, 230, 50),    # Verde Vibrante
+    (255, 30, 60),    # Vermelho Vivo
+    (220, 0, 255),    # Roxo/Magenta
+    (255, 120, 0),    # Laranja
+    (0, 80, 255)      # Azul Profundo
+]
+
+# Formas
+FORMAS = [
+    [[1,1,1,1]],             # I
+    [[1,1,1],[0,1,0]],       # T
+    [[1,1,0],[0,1,1]],       # S
+    [[0,1,1],[1,1,0]],       # Z
+    [[1,1],[1,1]],           # O
+    [[1,1,1],[1,0,0]],       # L
+    [[1,1,1],[0,0,1]]        # J
+]
+
+# Ações aceitas por Jogo.step()
+NADA, ESQUERDA, DIREITA, BAIXO, GIRAR, GRAVIDADE, QUEDA = range(7)
+
+# Valor de célula das linhas de lixo do modo versus (desenhado com a última cor)
+LIXO = len(CORES)
+
+# --- CLASSES E FUNÇÕES ---
+def criar_grid():
+    return [[0 for _ in range(COLS)] for _ in range(LINHAS)]
+
+class Peca:
+    def __init__(self, x, y, forma, rng=random):
+        self.x = x
+        self.y = y
+        self.forma = forma
+        self.cor = rng.choice(CORES)
+
+def colisao(peca, grid, dx=0, dy=0):
+    for i, linha in enumerate(peca.forma):
+        for j, bloco in enumerate(linha):
+            if bloco:
+                x = peca.x + j + dx
+                y = peca.y + i + dy
+                if x < 0 or x >= COLS or y >= LINHAS or grid[y][x]:
+                    return True
+    return False
+
+def fixar_peca(peca, grid, indice=None):
+    for i, linha in enumerate(peca.forma):
+        for j, bloco in enumerate(linha):
+            if bloco:
+                grid[peca.y + i][peca.x + j] = CORES.index(peca.cor) + 1
+                if indice is not None:
+                    indice.ocupar(peca.y + i, peca.x + j)
+
+def remover_linhas(grid, indice=None, linhas=None):
+    # Com o índice, só as linhas indicadas (as que a peça tocou) são verificadas
+    if indice is not None:
+        if linhas is None:
+            linhas = range(LINHAS)
+        cheias = sorted(i for i in linhas if indice.preenchidas[i] == COLS)
+        for i in reversed(cheias):
+            grid.pop(i)
+        for _ in cheias:
+            grid.insert(0, [0 for _ in range(COLS)])
+        if cheias:
+            indice.remover(cheias, grid)
+        return len(cheias)
+
+    linhas_removidas = 0
+    i = LINHAS-1
+    while i >= 0:
+        if 0 not in grid[i]:
+            grid.pop(i)
+            grid.insert(0,[0 for _ in range(COLS)])
+            linhas_removidas +=1
+            # a linha de cima desceu para a posição i: verificar de novo
+        else:
+            i -= 1
+    return linhas_removidas
+
+def rotacionar_forma(forma):
+    return [list(x)[::-1] for x in zip(*forma)]
+
+def rotacionar(peca):
+    peca.forma = rotacionar_forma(peca.forma)
+
+# --- ÍNDICE DO TABULEIRO ---
+# Estatísticas do grid mantidas a cada peça fixada e linha removida, sem
+# varrer o tabuleiro: células ocupadas por linha (linha cheia = COLS), altura
+# de cada coluna (LINHAS - linha do bloco mais alto, 0 se vazia) e buracos por
+# coluna (células vazias abaixo do bloco mais alto).
+class Indice:
+    def __init__(self, grid):
+        self.reconstruir(grid)
+
+    def reconstruir(self, grid):
+        self.preenchidas = [COLS - linha.count(0) for linha in grid]
+        self.alturas = [0] * COLS
+        self.buracos = [0] * COLS
+        for x in range(COLS):
+            self._coluna(grid, x)
+
+    def _coluna(self, grid, x):
+        # Recalcula altura e buracos de uma coluna
+        topo = next((i for i in range(LINHAS) if grid[i][x]), LINHAS)
+        self.alturas[x] = LINHAS - topo
+        self.buracos[x] = sum(1 for i in range(topo + 1, LINHAS) if not grid[i][x])
+
+    def topo(self, x):
+        # Linha do bloco mais alto da coluna (LINHAS se vazia)
+        return LINHAS - self.alturas[x]
+
+    def ocupar(self, y, x):
+        self.preenchidas[y] += 1
+        topo = self.topo(x)
+        if y < topo:
+            # Acima do topo: o vão entre a célula e o topo antigo vira buraco
+            self.buracos[x] += topo - y - 1
+            self.alturas[x] = LINHAS - y
+        else:
+            # Abaixo do topo: tapou um buraco
+            self.buracos[x] -= 1
+
+    def remover(self, cheias, grid):
+        # cheias: índices (antes da remoção) das linhas cheias já tiradas do grid.
+        # Linhas cheias não têm buracos: uma coluna só muda além de baixar a
+        # altura se o seu bloco mais alto estava numa linha removida (os buracos
+        # logo abaixo dele viram espaço livre).
+        removidas = set(cheias)
+        self.preenchidas = [0] * len(cheias) + [p for i, p in enumerate(self.preenchidas) if i not in removidas]
+        for x in range(COLS):
+            topo = self.topo(x)
+            if topo in removidas:
+                # Tudo acima do topo antigo estava vazio e desceu len(cheias) linhas:
+                # o novo topo é procurado só a partir dali, e os vãos pulados até
+                # ele deixam de ser buracos (sem varrer a coluna inteira)
+                inicio = topo + len(cheias)
+                novo = next((i for i in range(inicio, LINHAS) if grid[i][x]), LINHAS)
+                self.buracos[x] -= novo - inicio
+                self.alturas[x] = LINHAS - novo
+            elif self.alturas[x]:
+                self.alturas[x] -= len(cheias)
+
+    def adicionar_lixo(self, linhas, buraco):
+        # Linhas de lixo entraram por baixo: cada coluna sobe linhas células; a
+        # do buraco só sobe se tinha blocos, e o buraco fica embaixo deles
+        self.preenchidas = self.preenchidas[linhas:] + [COLS - 1] * linhas
+        for x in range(COLS):
+            if x != buraco:
+                self.alturas[x] += linhas
+            elif self.alturas[x]:
+                self.alturas[x] += linhas
+                self.buracos[x] += linhas
+
+def distancia_queda(peca, grid, indice):
+    # Quantas linhas a peça cai até encostar, pelas alturas das colunas: O(largura
+    # da peça). Se a peça está embaixo de um bloco da própria coluna (deslizou
+    # sob uma saliência), as alturas não bastam e a queda é testada com colisao().
+    distancia = LINHAS
+    for j in range(len(peca.forma[0])):
+        fundo = max((i for i, linha in enumerate(peca.forma) if linha[j]), default=None)
+        if fundo is None:
+            continue
+        y = peca.y + fundo
+        topo = indice.topo(peca.x + j)
+        if y >= topo:
+            distancia = 0
+            while not colisao(peca, grid, dy=distancia + 1):
+                distancia += 1
+            return distancia
+        distancia = min(distancia, topo - y - 1)
+    return distancia
+
+def velocidade_queda(nivel):
+    # Intervalo da gravidade em ms para o nível
+    return max(100, 500 - (nivel - 1) * 50)
+
+# --- ESTADO DO JOGO ---
+class Jogo:
+    def __init__(self, rng=random):
+        # rng: qualquer objeto com choice() (o módulo random ou random.Random(seed))
+        self.rng = rng
+        # Chamado com cada ação recebida por step() (gravação de replays)
+        self.ao_step = None
+        self.reiniciar()
+
+    @property
+    def grid(self):
+        return self._grid
+
+    @grid.setter
+    def grid(self, grid):
+        # Trocar o grid inteiro (novo jogo, save, testes) reconstrói o índice
+        self._grid = grid
+        self.indice = Indice(grid)
+
+    def nova_peca(self, x=0, y=0):
+        return Peca(x, y, self.rng.choice(FORMAS), self.rng)
+
+    def reiniciar(self):
+        self.grid = criar_grid()
+        self.peca = self.nova_peca(COLS//2-1, 0)
+        self.proxima = self.nova_peca()
+        self.pontuacao = 0
+        self.nivel = 1
+        self.linhas_totais = 0
+        self.game_over = False
+        # Peça fixada no último step (None se nenhuma)
+        self.fixada = None
+
+    def carregar(self, dados):
+        # Formato de exportar(); saves antigos (savegame.json) não têm a peça
+        # atual, a cor da próxima nem o estado do rng
+        self.grid = [list(linha) for linha in dados["grid"]]
+        self.pontuacao = dados["score"]
+        self.nivel = dados["level"]
+        self.linhas_totais = dados["lines"]
+        self.proxima = Peca(0, 0, FORMAS[dados["next_peca"]], self.rng)
+        if "next_cor" in dados:
+            self.proxima.cor = CORES[dados["next_cor"]]
+        if "peca" in dados:
+            peca = dados["peca"]
+            self.peca = Peca(peca["x"], peca["y"], [list(linha) for linha in peca["forma"]], self.rng)
+            self.peca.cor = CORES[peca["cor"]]
+        else:
+            self.peca = self.nova_peca(COLS//2-1, 0)
+        if "rng" in dados:
+            versao, estado, gauss = dados["rng"]
+            self.rng.setstate((versao, tuple(estado), gauss))
+        self.game_over = False
+        self.fixada = None
+
+    def exportar(self):
+        # Estado completo: continuar a partida não sorteia nada de novo
+        return {
+            "grid": self.grid,
+            "score": self.pontuacao,
+            "level": self.nivel,
+            "lines": self.linhas_totais,
+            "next_peca": FORMAS.index(self.proxima.forma),
+            "next_cor": CORES.index(self.proxima.cor),
+            "peca": {
+                "forma": self.peca.forma,
+                "x": self.peca.x,
+                "y": self.peca.y,
+                "cor": CORES.index(self.peca.cor),
+            },
+            "rng": self.rng.getstate(),
+        }
+
+    def velocidade_queda(self):
+        return velocidade_queda(self.nivel)
+
+    def distancia_queda(self):
+        return distancia_queda(self.peca, self.grid, self.indice)
+
+    def fantasma(self):
+        # Linha em que a peça atual pararia (prévia da queda)
+        return self.peca.y + self.distancia_queda()
+
+    def adicionar_lixo(self, linhas, buraco):
+        # Modo versus: linhas cheias menos a coluna buraco entram por baixo e
+        # empurram o tabuleiro para cima. Blocos empurrados para fora ou a peça
+        # atual encoberta encerram a partida.
+        if linhas <= 0 or self.game_over:
+            return
+        transbordou = any(self.indice.preenchidas[:linhas])
+        if transbordou:
+            self.game_over = True
+        del self.grid[:linhas]
+        for _ in range(linhas):
+            linha = [LIXO] * COLS
+            linha[buraco] = 0
+            self.grid.append(linha)
+        if transbordou:
+            # Colunas empurradas para fora não cabem na conta incremental
+            self.indice.reconstruir(self.grid)
+        else:
+            self.indice.adicionar_lixo(linhas, buraco)
+        if colisao(self.peca, self.grid):
+            self.game_over = True
+
+    def step(self, acao):
+        # Aplica uma ação e devolve o número de linhas removidas
+        self.fixada = None
+        if self.ao_step is not None:
+            self.ao_step(acao)
+        if self.game_over:
+            return 0
+
+        peca, grid = self.peca, self.grid
+        if acao == ESQUERDA:
+            if not colisao(peca, grid, dx=-1):
+                peca.x -= 1
+        elif acao == DIREITA:
+            if not colisao(peca, grid, dx=1):
+                peca.x += 1
+        elif acao == BAIXO:
+            if not colisao(peca, grid, dy=1):
+                peca.y += 1
+        elif acao == GIRAR:
+            forma = peca.forma
+            rotacionar(peca)
+            if colisao(peca, grid):
+                # desfaz rotação
+                peca.forma = forma
+        elif acao == GRAVIDADE:
+            if not colisao(peca, grid, dy=1):
+                peca.y += 1
+            else:
+                return self._travar()
+        elif acao == QUEDA:
+            # Hard drop: cai direto e trava
+            peca.y += self.distancia_queda()
+            return self._travar()
+        return 0
+
+    def _travar(self):
+        fixar_peca(self.peca, self.grid, self.indice)
+        self.fixada = self.peca
+        tocadas = range(self.peca.y, self.peca.y + len(self.peca.forma))
+        linhas_removidas = remover_linhas(self.grid, self.indice, tocadas)
+        if linhas_removidas > 0:
+            self.linhas_totais += linhas_removidas
+            self.pontuacao += linhas_removidas * 100 * self.nivel
+            # Lógica de Nível (fase)
+            self.nivel = max(self.nivel, (self.linhas_totais // 10) + 1)
+
+        self.peca = self.proxima
+        self.proxima = self.nova_peca()
+        if colisao(self.peca, self.grid):
+            self.game_over = True
+        return linhas_removidas
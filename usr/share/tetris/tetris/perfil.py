@@ -0,0 +1,197 @@
+import collections
+import contextlib
+import json
+import platform
+import time
+
+# --- PERFIL POR QUADRO ---
+# Instrumentação opcional do loop principal: cada fase do quadro é cronometrada
+# com perf_counter e somada por quadro. Mantém uma janela dos últimos quadros para
+# mostrar tempo atual/médio/p99 na tela e, se houver arquivo, grava uma linha por
+# quadro (CSV ou JSON lines, pela extensão) com escrita bufferizada.
+#
+# Latência de entrada: coletou() é chamado a cada pygame.event.get(). Um evento
+# chegou em algum momento depois da coleta anterior, e é dali que a latência é
+# contada (pior caso, incluindo a espera em clock.tick); repetições do DAS/ARR
+# contam desde a última coleta do quadro anterior. marcar_entrada() anota uma
+# ação que mudou o jogo; no fim do quadro (depois do display.update) mede quanto
+# tempo e quantos quadros foram apresentados desde a chegada, contando este.
+#
+# Desligado, fase() devolve um contexto nulo e o custo é só a chamada.
+
+FASES = ["fundo", "tabuleiro", "peca", "hud", "botoes", "overlay",
+         "display", "eventos", "logica", "travar"]
+
+JANELA = 600  # quadros usados para média e p99
+BUFFER_ARQUIVO = 1 << 16
+
+_NULO = contextlib.nullcontext()
+
+class Perfil:
+    def __init__(self, caminho=""):
+        self.ativo = False
+        self.overlay = False
+        self.amostras = collections.deque(maxlen=JANELA)
+        self.latencias = collections.deque(maxlen=JANELA)  # (ms, quadros)
+        self._entradas = []  # (instante, quadro) ainda não apresentados
+        # Última coleta de eventos: (instante, quadros encerrados até ali)
+        self._coleta = (time.perf_counter(), 0)
+        self._chegada = None  # coleta anterior aos eventos deste quadro
+        self._chegada_repeticao = self._coleta
+        self.tempos = dict.fromkeys(FASES, 0.0)
+        self._pilha = []
+        self.quadro = 0
+        self.inicio = 0.0
+        self.espera = 0.0
+        self.arquivo = None
+        self.json = False
+        if caminho:
+            self.json = caminho.endswith(".jsonl")
+            self.arquivo = open(caminho, "w", buffering=BUFFER_ARQUIVO)
+            if not self.json:
+                self.arquivo.write(",".join(["quadro", "total"] + FASES + ["entrada"]) + "\n")
+
+    def alternar_overlay(self):
+        # Passa a valer no próximo quadro, para não medir um quadro pela metade
+        self.overlay = not self.overlay
+
+    def iniciar_quadro(self):
+        self._chegada = None
+        self._chegada_repeticao = self._coleta
+        self.ativo = self.overlay or self.arquivo is not None
+        if not self.ativo:
+            return
+        for fase in self.tempos:
+            self.tempos[fase] = 0.0
+        self.espera = 0.0
+        self.inicio = time.perf_counter()
+
+    def fase(self, nome):
+        if not self.ativo:
+            return _NULO
+        return self._medir(nome)
+
+    @contextlib.contextmanager
+    def _medir(self, nome):
+        # Tempo exclusivo: fases aninhadas são descontadas da fase de fora
+        inicio = time.perf_counter()
+        self._pilha.append(0.0)
+        try:
+            yield
+        finally:
+            duracao = time.perf_counter() - inicio
+            self.tempos[nome] += duracao - self._pilha.pop()
+            if self._pilha:
+                self._pilha[-1] += duracao
+
+    def adicionar(self, nome, segundos):
+        # Para trechos cuja fase só é conhecida depois (ex.: step que travou a peça)
+        if self.ativo:
+            self.tempos[nome] += segundos
+            if self._pilha:
+                self._pilha[-1] += segundos
+
+    def coletou(self, eventos):
+        # Chamar logo depois de cada pygame.event.get()
+        if eventos and self._chegada is None:
+            self._chegada = self._coleta
+        self._coleta = (time.perf_counter(), self.quadro)
+
+    def marcar_entrada(self, repeticao=False):
+        # repeticao: ação do DAS/ARR, sem evento próprio
+        if self.ativo:
+            chegada = self._chegada_repeticao if repeticao or self._chegada is None else self._chegada
+            self._entradas.append(chegada)
+
+    @contextlib.contextmanager
+    def esperando(self):
+        # Tempo dormindo em clock.tick(): não conta como trabalho do quadro
+        inicio = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.espera += time.perf_counter() - inicio
+
+    def encerrar_quadro(self):
+        if not self.ativo:
+            return
+        agora = time.perf_counter()
+        total = agora - self.inicio - self.espera
+        self.amostras.append(total)
+        # Entradas anotadas até aqui já foram desenhadas e enviadas ao display
+        entrada = 0.0
+        for instante, quadro in self._entradas:
+            latencia = (agora - instante) * 1000
+            self.latencias.append((latencia, self.quadro - quadro + 1))
+            entrada = max(entrada, latencia)
+        self._entradas.clear()
+        self.quadro += 1
+        if self.arquivo is not None:
+            if self.json:
+                linha = {"quadro": self.quadro, "total": total * 1000}
+                linha.update((fase, t * 1000) for fase, t in self.tempos.items())
+                linha["entrada"] = entrada
+                self.arquivo.write(json.dumps(linha) + "\n")
+            else:
+                valores = [str(self.quadro), f"{total * 1000:.3f}"]
+                valores += [f"{self.tempos[fase] * 1000:.3f}" for fase in FASES]
+                valores.append(f"{entrada:.3f}")
+                self.arquivo.write(",".join(valores) + "\n")
+
+    def resumo(self):
+        # (atual, média, p99) do tempo de trabalho por quadro, em ms
+        if not self.amostras:
+            return 0.0, 0.0, 0.0
+        ordenadas = sorted(self.amostras)
+        p99 = ordenadas[min(len(ordenadas) - 1, int(len(ordenadas) * 0.99))]
+        media = sum(ordenadas) / len(ordenadas)
+        return self.amostras[-1] * 1000, media * 1000, p99 * 1000
+
+    def resumo_entrada(self):
+        # (média ms, p99 ms, média de quadros) da entrada até a tela
+        if not self.latencias:
+            return 0.0, 0.0, 0.0
+        ordenadas = sorted(ms for ms, _ in self.latencias)
+        p99 = ordenadas[min(len(ordenadas) - 1, int(len(ordenadas) * 0.99))]
+        quadros = sum(q for _, q in self.latencias) / len(self.latencias)
+        return sum(ordenadas) / len(ordenadas), p99, quadros
+
+    def fechar(self):
+        if self.arquivo is not None:
+            self.arquivo.close()
+            self.arquivo = None
+
+# --- TEMPOS DE INICIALIZAÇÃO ---
+# Marcos da abertura do jogo, em ms desde o começo do import de main.py:
+#   import:          pygame e módulos do jogo importados
+#   init:            módulos do pygame iniciados e display aberto
+#   primeiro_quadro: primeiro quadro enviado ao display
+#   carregado:       quadro já com as fontes do sistema e a imagem de fundo
+# Com arquivo, cada abertura acrescenta uma linha JSON, para comparar versões.
+
+MARCOS = ["import", "init", "primeiro_quadro", "carregado"]
+
+class Inicio:
+    def __init__(self, origem, caminho=""):
+        self.origem = origem
+        self.caminho = caminho
+        self.marcos = {}
+
+    def marcar(self, nome, instante=None):
+        # Só a primeira marcação de cada marco conta
+        if nome in self.marcos:
+            return
+        if instante is None:
+            instante = time.perf_counter()
+        self.marcos[nome] = (instante - self.origem) * 1000
+        if self.completo() and self.caminho:
+            linha = {"data": time.strftime("%Y-%m-%dT%H:%M:%S"), "python": platform.python_version()}
+            linha.update(self.marcos)
+            with open(self.caminho, "a") as f:
+                f.write(json.dumps(linha) + "\n")
+
+    def completo(self):
+        return MARCOS[-1] in self.marcos
+
+    def resumo(self):
+        return "  ".join(f"{nome}: {self.marcos[nome]:.0f} ms" for nome in MARCOS if nome in self.marcos)
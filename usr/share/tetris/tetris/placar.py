@@ -0,0 +1,162 @@
+import getpass
+import os
+import queue
+import sqlite3
+import threading
+import time
+
+from salvamento import pasta_dados_padrao, avisar
+
+# --- PLACAR (SQLITE) ---
+# Histórico de partidas num banco SQLite local: jogador, data, pontuação, nível,
+# linhas, duração (segundos jogados, sem pausas), peças e peças por segundo.
+# Índices por pontuação (top N geral) e por (jogador, pontuação) (top N e
+# estatísticas de um jogador).
+#
+# Registrar uma partida só põe a linha numa fila: uma thread grava em lote, uma
+# transação por lote, e a thread principal nunca espera o disco. O top N fica
+# em memória (melhores()) e só é relido do banco quando uma partida inserida
+# entra nele; ao_atualizar é chamado (na thread do placar) quando isso acontece.
+#
+# python placar.py [ARQUIVO] [--jogador NOME] [--top N]
+
+TOP = 5
+
+_ESQUEMA = """
+CREATE TABLE IF NOT EXISTS partidas (
+    id INTEGER PRIMARY KEY,
+    jogador TEXT NOT NULL,
+    data TEXT NOT NULL,
+    pontuacao INTEGER NOT NULL,
+    nivel INTEGER NOT NULL,
+    linhas INTEGER NOT NULL,
+    duracao REAL NOT NULL,
+    pecas INTEGER NOT NULL,
+    pecas_por_segundo REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS partidas_pontuacao ON partidas (pontuacao DESC);
+CREATE INDEX IF NOT EXISTS partidas_jogador ON partidas (jogador, pontuacao DESC);
+"""
+
+_INSERIR = """INSERT INTO partidas (jogador, data, pontuacao, nivel, linhas, duracao, pecas, pecas_por_segundo)
+VALUES (?, ?, ?, ?, ?, ?, ?, ?)"""
+
+def jogador_padrao():
+    # TETRIS_JOGADOR ou o usuário do sistema
+    nome = os.environ.get("TETRIS_JOGADOR")
+    if nome:
+        return nome
+    try:
+        return getpass.getuser()
+    except (OSError, KeyError):
+        return "jogador"
+
+def abrir(caminho):
+    conexao = sqlite3.connect(caminho)
+    conexao.execute("PRAGMA journal_mode=WAL")
+    conexao.execute("PRAGMA synchronous=NORMAL")
+    conexao.executescript(_ESQUEMA)
+    return conexao
+
+def consultar_top(conexao, n=TOP, jogador=None):
+    # [(jogador, pontuação, nível, linhas), ...] do maior para o menor
+    if jogador is None:
+        cursor = conexao.execute(
+            "SELECT jogador, pontuacao, nivel, linhas FROM partidas ORDER BY pontuacao DESC LIMIT ?", (n,))
+    else:
+        cursor = conexao.execute(
+            "SELECT jogador, pontuacao, nivel, linhas FROM partidas WHERE jogador = ? "
+            "ORDER BY pontuacao DESC LIMIT ?", (jogador, n))
+    return cursor.fetchall()
+
+def consultar_estatisticas(conexao, jogador):
+    # (partidas, melhor pontuação, pontuação média, linhas, segundos jogados, peças/s médio)
+    return conexao.execute(
+        "SELECT COUNT(*), MAX(pontuacao), AVG(pontuacao), SUM(linhas), SUM(duracao), "
+        "SUM(pecas) / NULLIF(SUM(duracao), 0) FROM partidas WHERE jogador = ?", (jogador,)).fetchone()
+
+class Placar:
+    def __init__(self, caminho, top=TOP, ao_atualizar=None):
+        self.caminho = caminho
+        self.top = top
+        self.ao_atualizar = ao_atualizar
+        # Trocado inteiro pela thread (nunca alterado no lugar): ler não precisa de trava
+        self._melhores = []
+        self.versao = 0  # muda a cada releitura do top N
+        self.falhou = False  # só a primeira falha do banco é avisada
+        self.fila = queue.Queue()
+        self.thread = threading.Thread(target=self._trabalhar, name="placar", daemon=True)
+        self.thread.start()
+
+    def melhores(self):
+        return self._melhores
+
+    def registrar(self, jogador, pontuacao, nivel, linhas, duracao, pecas):
+        pecas_por_segundo = pecas / duracao if duracao > 0 else 0.0
+        self.fila.put((jogador, time.strftime("%Y-%m-%dT%H:%M:%S"), pontuacao, nivel, linhas,
+                       duracao, pecas, pecas_por_segundo))
+
+    def _recarregar(self, conexao):
+        self._melhores = consultar_top(conexao, self.top)
+        self.versao += 1
+        if self.ao_atualizar is not None:
+            self.ao_atualizar()
+
+    def _falha(self, erro):
+        if not self.falhou:
+            self.falhou = True
+            avisar(f"placar {self.caminho}: {erro}")
+
+    def _trabalhar(self):
+        try:
+            conexao = abrir(self.caminho)
+            self._recarregar(conexao)
+        except sqlite3.Error as erro:
+            self._falha(erro)
+            conexao = None  # sem banco: as partidas são descartadas
+        while True:
+            lote = [self.fila.get()]
+            while True:
+                try:
+                    lote.append(self.fila.get_nowait())
+                except queue.Empty:
+                    break
+            fim = None in lote
+            lote = [linha for linha in lote if linha is not None]
+            if lote and conexao is not None:
+                try:
+                    with conexao:
+                        conexao.executemany(_INSERIR, lote)
+                    # O top só muda se alguma partida nova entrou nele
+                    minimo = self._melhores[-1][1] if len(self._melhores) >= self.top else None
+                    if minimo is None or any(linha[2] > minimo for linha in lote):
+                        self._recarregar(conexao)
+                except sqlite3.Error as erro:
+                    self._falha(erro)
+            if fim:
+                if conexao is not None:
+                    conexao.close()
+                return
+
+    def fechar(self):
+        # Grava o que estiver na fila e encerra a thread
+        self.fila.put(None)
+        self.thread.join()
+
+if __name__ == "__main__":
+    import argparse
+    parser = argparse.ArgumentParser(description="Placar e estatísticas das partidas")
+    parser.add_argument("arquivo", nargs="?", default=os.path.join(pasta_dados_padrao(), "placar.db"))
+    parser.add_argument("--jogador", help="top e estatísticas de um jogador")
+    parser.add_argument("--top", type=int, default=10)
+    a = parser.parse_args()
+    os.makedirs(os.path.dirname(os.path.abspath(a.arquivo)), exist_ok=True)
+    conexao = abrir(a.arquivo)
+    for posicao, (jogador, pontuacao, nivel, linhas) in enumerate(consultar_top(conexao, a.top, a.jogador), 1):
+        print(f"{posicao:3}. {jogador:<16} {pontuacao:>8}  nível {nivel:<3} linhas {linhas}")
+    if a.jogador:
+        partidas, melhor, media, linhas, segundos, pps = consultar_estatisticas(conexao, a.jogador)
+        if partidas:
+            print(f"{partidas} partidas  melhor {melhor}  média {media:.0f}  linhas {linhas}"
+                  f"  tempo {segundos / 60:.1f} min  {pps or 0:.2f} peças/s")
+    conexao.close()
@@ -0,0 +1,171 @@
+import os
+import random
+import struct
+import time
+
+from nucleo import COLS, LINHAS, Jogo
+
+# --- GRAVAÇÃO E REPLAY ---
+# Uma partida é determinística dado o seed do RNG e a sequência de ações passadas
+# a Jogo.step() (teclas, gravidade e bot). O arquivo .ttr guarda:
+#   cabeçalho: "TTRP", versão, COLS, LINHAS (uint16), seed (uint64)
+#   eventos:   byte(ação) + varint(ms desde o evento anterior), um por step
+#   rodapé:    FIM, pontuação, linhas, nível, game over e o grid final (1 byte/célula)
+# A ação vem antes do intervalo porque FIM não é uma ação válida, mas pode ser
+# o primeiro byte de um varint (255, 383, 511... ms).
+# O replay pode rodar em tempo real com tela ou sem tela, o mais rápido possível,
+# e confere o estado final com o gravado.
+
+MAGICO = b"TTRP"
+VERSAO = 3
+FIM = 0xFF
+_CABECALHO = struct.Struct("<4sBHHQ")
+_RODAPE = struct.Struct("<IIIB")
+
+def _varint(valor):
+    saida = bytearray()
+    while True:
+        byte = valor & 0x7F
+        valor >>= 7
+        if valor:
+            saida.append(byte | 0x80)
+        else:
+            saida.append(byte)
+            return saida
+
+def _ler_varint(dados, pos):
+    valor = deslocamento = 0
+    while True:
+        byte = dados[pos]
+        pos += 1
+        valor |= (byte & 0x7F) << deslocamento
+        if not byte & 0x80:
+            return valor, pos
+        deslocamento += 7
+
+def estado_final(jogo):
+    return (jogo.pontuacao, jogo.linhas_totais, jogo.nivel, jogo.game_over,
+            bytes(valor for linha in jogo.grid for valor in linha))
+
+class Gravador:
+    def __init__(self, jogo, caminho, seed):
+        # O jogo deve ter acabado de ser reiniciado com random.Random(seed)
+        self.jogo = jogo
+        self.arquivo = open(caminho, "wb")
+        self.arquivo.write(_CABECALHO.pack(MAGICO, VERSAO, COLS, LINHAS, seed))
+        self.ultimo = time.perf_counter()
+        jogo.ao_step = self.registrar
+
+    def registrar(self, acao):
+        agora = time.perf_counter()
+        delta = int((agora - self.ultimo) * 1000)
+        self.ultimo += delta / 1000
+        self.arquivo.write(bytes((acao,)) + _varint(delta))
+
+    def fechar(self):
+        if self.arquivo is None:
+            return
+        self.jogo.ao_step = None
+        pontuacao, linhas, nivel, game_over, grid = estado_final(self.jogo)
+        self.arquivo.write(bytes((FIM,)) + _RODAPE.pack(pontuacao, linhas, nivel, game_over) + grid)
+        self.arquivo.close()
+        self.arquivo = None
+
+def nova_partida_gravada(jogo, pasta):
+    # Reinicia o jogo com um seed novo e começa a gravar em pasta/<data>-<seed>.ttr
+    seed = random.SystemRandom().getrandbits(63)
+    jogo.rng = random.Random(seed)
+    jogo.reiniciar()
+    os.makedirs(pasta, exist_ok=True)
+    nome = time.strftime("%Y%m%d-%H%M%S") + f"-{seed}.ttr"
+    return Gravador(jogo, os.path.join(pasta, nome), seed)
+
+def ler(caminho):
+    # Devolve (seed, [(delta_ms, acao), ...], estado final ou None se incompleto)
+    with open(caminho, "rb") as f:
+        dados = f.read()
+    if dados[:4] != MAGICO or len(dados) < _CABECALHO.size or dados[4] != VERSAO:
+        raise ValueError(f"{caminho}: não é um replay suportado")
+    _, _, cols, linhas, seed = _CABECALHO.unpack_from(dados)
+    if (cols, linhas) != (COLS, LINHAS):
+        raise ValueError(f"{caminho}: gravado num tabuleiro {cols}x{linhas}")
+
+    eventos = []
+    pos = _CABECALHO.size
+    while pos < len(dados):
+        if dados[pos] == FIM:
+            pos += 1
+            pontuacao, linhas_totais, nivel, game_over = _RODAPE.unpack_from(dados, pos)
+            grid = dados[pos + _RODAPE.size:pos + _RODAPE.size + COLS*LINHAS]
+            return seed, eventos, (pontuacao, linhas_totais, nivel, bool(game_over), grid)
+        acao = dados[pos]
+        try:
+            delta, pos = _ler_varint(dados, pos + 1)
+        except IndexError:
+            break  # último evento cortado no meio
+        eventos.append((delta, acao))
+    # Gravação interrompida (sem rodapé): ainda pode ser reproduzida
+    return seed, eventos, None
+
+def reproduzir(caminho, tempo_real=False):
+    # Devolve (confere, jogo): confere é None se o arquivo não tem estado final
+    seed, eventos, final = ler(caminho)
+    jogo = Jogo(random.Random(seed))
+    if tempo_real:
+        _reproduzir_com_tela(jogo, eventos)
+    else:
+        step = jogo.step
+        for _delta, acao in eventos:
+            step(acao)
+    if final is None:
+        return None, jogo
+    return estado_final(jogo) == final, jogo
+
+def _reproduzir_com_tela(jogo, eventos):
+    import pygame
+    import main
+
+    main.iniciar_pygame()
+    pygame.display.set_caption("Tetris Cube - replay")
+    tela = pygame.display.set_mode((main.LARGURA_JANELA, main.ALTURA_JANELA))
+    main.TAM_BLOCO = main.tamanho_bloco(*tela.get_size())
+    clock = pygame.time.Clock()
+    tabuleiro_x = tabuleiro_y = 50
+
+    inicio = time.perf_counter()
+    alvo = 0.0
+    for delta, acao in eventos:
+        alvo += delta / 1000
+        # Desenha até chegar a hora do próximo evento
+        while time.perf_counter() - inicio < alvo:
+            for event in pygame.event.get():
+                if event.type == pygame.QUIT:
+                    pygame.quit()
+                    return
+            tela.fill(main.PRETO)
+            main.desenhar_moldura_3d(tela, tabuleiro_x-4, tabuleiro_y-4, COLS*main.TAM_BLOCO+8, LINHAS*main.TAM_BLOCO+8, (30,30,30))
+            main.desenhar_tabuleiro(tela, jogo.grid, tabuleiro_x, tabuleiro_y)
+            main.desenhar_peca(tela, jogo.peca, tabuleiro_x, tabuleiro_y)
+            centro_x = tabuleiro_x + COLS*main.TAM_BLOCO + 150
+            main.desenhar_texto(tela, "SCORE", 24, centro_x, tabuleiro_y + 20)
+            main.desenhar_texto(tela, str(jogo.pontuacao), 32, centro_x, tabuleiro_y + 55, cor=(255,215,0))
+            pygame.display.flip()
+            clock.tick(60)
+        jogo.step(acao)
+    pygame.quit()
+
+if __name__ == "__main__":
+    import argparse
+    parser = argparse.ArgumentParser(description="Reproduz uma partida gravada (.ttr)")
+    parser.add_argument("arquivo")
+    parser.add_argument("--tempo-real", action="store_true", help="reproduz com tela, no tempo original")
+    a = parser.parse_args()
+    inicio = time.perf_counter()
+    confere, jogo = reproduzir(a.arquivo, tempo_real=a.tempo_real)
+    tempo = time.perf_counter() - inicio
+    print(f"pontuação: {jogo.pontuacao}  linhas: {jogo.linhas_totais}  nível: {jogo.nivel}  ({tempo:.3f}s)")
+    if confere is None:
+        print("gravação sem estado final (interrompida)")
+    else:
+        print("estado final confere" if confere else "ESTADO FINAL DIVERGENTE")
+        raise SystemExit(0 if confere else 1)
@@ -0,0 +1,201 @@
+import json
+import os
+import struct
+import sys
+import threading
+import zlib
+
+from nucleo import COLS, LINHAS
+
+# --- SAVE BINÁRIO ---
+# Formato compacto e versionado, gravado em segundo plano depois de cada peça
+# travada. Tudo little-endian:
+#   cabeçalho: "TTSV", versão, COLS, LINHAS (uint16)
+#   placar:    pontuação, linhas, nível (uint32)
+#   peça:      x, y (int16), cor, altura, largura + uma máscara de bits por linha da forma
+#   próxima:   índice da forma, cor
+#   grid:      LINHAS linhas com 3 bits por célula (valor 0..7)
+#   rng:       versão, 625 uint32 do Mersenne Twister, gauss_next (flag + double)
+#   crc32 de tudo o que vem antes
+# O arquivo é escrito num .tmp, sincronizado e renomeado por cima do anterior:
+# uma queda no meio da escrita deixa o save antigo intacto.
+#
+# carregar() também aceita o savegame.json antigo (sem peça atual nem rng).
+#
+# Save e placar ficam numa pasta do usuário (pasta_dados_padrao): instalado, o
+# diretório do jogo (/opt/tetris) é do root.
+
+MAGICO = b"TTSV"
+VERSAO = 2
+
+_CABECALHO = struct.Struct("<4sBHH")
+_PLACAR = struct.Struct("<III")
+_PECA = struct.Struct("<hhBBB")
+_PROXIMA = struct.Struct("<BB")
+_RNG = struct.Struct("<B625IBd")
+_CRC = struct.Struct("<I")
+
+def pasta_dados_padrao():
+    pasta = os.environ.get("TETRIS_DADOS")
+    if pasta:
+        return pasta
+    base = os.environ.get("XDG_DATA_HOME") or os.path.join(os.path.expanduser("~"), ".local", "share")
+    return os.path.join(base, "tetris-cube")
+
+def avisar(mensagem):
+    # Falhas de gravação em segundo plano: avisadas no stderr em vez de sumirem
+    print(f"tetris: {mensagem}", file=sys.stderr)
+
+BITS_CELULA = 3
+BYTES_LINHA = (COLS * BITS_CELULA + 7) // 8
+
+def serializar(dados):
+    # dados no formato de Jogo.exportar()
+    partes = [
+        _CABECALHO.pack(MAGICO, VERSAO, COLS, LINHAS),
+        _PLACAR.pack(dados["score"], dados["lines"], dados["level"]),
+    ]
+    peca = dados["peca"]
+    forma = peca["forma"]
+    partes.append(_PECA.pack(peca["x"], peca["y"], peca["cor"], len(forma), len(forma[0])))
+    partes.append(bytes(sum(1 << j for j, bloco in enumerate(linha) if bloco) for linha in forma))
+    partes.append(_PROXIMA.pack(dados["next_peca"], dados["next_cor"]))
+    for linha in dados["grid"]:
+        valor = 0
+        for j, celula in enumerate(linha):
+            valor |= celula << (j * BITS_CELULA)
+        partes.append(valor.to_bytes(BYTES_LINHA, "little"))
+    versao, estado, gauss = dados["rng"]
+    partes.append(_RNG.pack(versao, *estado, gauss is not None, gauss or 0.0))
+    corpo = b"".join(partes)
+    return corpo + _CRC.pack(zlib.crc32(corpo))
+
+def desserializar(conteudo):
+    corpo, (crc,) = conteudo[:-_CRC.size], _CRC.unpack(conteudo[-_CRC.size:])
+    if zlib.crc32(corpo) != crc:
+        raise ValueError("save corrompido (crc32)")
+    if corpo[:4] != MAGICO or len(corpo) < _CABECALHO.size or corpo[4] != VERSAO:
+        raise ValueError("save em formato desconhecido")
+    _, _, cols, linhas = _CABECALHO.unpack_from(corpo)
+    if (cols, linhas) != (COLS, LINHAS):
+        raise ValueError(f"save de um tabuleiro {cols}x{linhas}")
+    pos = _CABECALHO.size
+
+    pontuacao, linhas_totais, nivel = _PLACAR.unpack_from(corpo, pos)
+    pos += _PLACAR.size
+
+    x, y, cor, altura, largura = _PECA.unpack_from(corpo, pos)
+    pos += _PECA.size
+    forma = [[(mascara >> j) & 1 for j in range(largura)] for mascara in corpo[pos:pos + altura]]
+    pos += altura
+
+    proxima, proxima_cor = _PROXIMA.unpack_from(corpo, pos)
+    pos += _PROXIMA.size
+
+    grid = []
+    celula = (1 << BITS_CELULA) - 1
+    for _ in range(LINHAS):
+        valor = int.from_bytes(corpo[pos:pos + BYTES_LINHA], "little")
+        grid.append([(valor >> (j * BITS_CELULA)) & celula for j in range(COLS)])
+        pos += BYTES_LINHA
+
+    versao_rng, *estado, tem_gauss, gauss = _RNG.unpack_from(corpo, pos)
+    return {
+        "grid": grid,
+        "score": pontuacao,
+        "level": nivel,
+        "lines": linhas_totais,
+        "peca": {"forma": forma, "x": x, "y": y, "cor": cor},
+        "next_peca": proxima,
+        "next_cor": proxima_cor,
+        "rng": (versao_rng, tuple(estado), gauss if tem_gauss else None),
+    }
+
+def gravar(caminho, conteudo):
+    # Escrita atômica: .tmp + fsync + rename
+    temporario = caminho + ".tmp"
+    with open(temporario, "wb") as f:
+        f.write(conteudo)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(temporario, caminho)
+
+def carregar(caminho, caminho_legado=None):
+    # Devolve os dados do save (formato de Jogo.exportar) ou None
+    try:
+        with open(caminho, "rb") as f:
+            return desserializar(f.read())
+    except (OSError, ValueError, struct.error):
+        pass
+    if caminho_legado:
+        try:
+            with open(caminho_legado, "r") as f:
+                dados = json.load(f)
+            # O save antigo não guarda o tamanho: só serve para o tabuleiro atual
+            if len(dados["grid"]) == LINHAS and all(len(linha) == COLS for linha in dados["grid"]):
+                return dados
+        except (OSError, ValueError, KeyError, TypeError):
+            pass
+    return None
+
+def apagar(*caminhos):
+    for caminho in caminhos:
+        if caminho and os.path.exists(caminho):
+            try:
+                os.remove(caminho)
+            except OSError as erro:
+                # O save legado fica na pasta de instalação, que pode ser só leitura
+                avisar(f"não foi possível apagar {caminho}: {erro}")
+
+class Autosave:
+    # Thread que grava o snapshot mais recente; snapshots que chegam enquanto
+    # uma escrita está em andamento substituem o pendente (só o último importa)
+    def __init__(self, caminho):
+        self.caminho = caminho
+        self.pendente = None
+        self.rodando = True
+        self.falhou = False  # só a primeira falha de escrita é avisada
+        self.condicao = threading.Condition()
+        self.escrita = threading.Lock()
+        self.thread = threading.Thread(target=self._trabalhar, name="autosave", daemon=True)
+        self.thread.start()
+
+    def agendar(self, jogo):
+        # A serialização acontece aqui, na thread principal, para copiar o
+        # estado de um instante só; a thread só escreve os bytes
+        conteudo = serializar(jogo.exportar())
+        with self.condicao:
+            self.pendente = conteudo
+            self.condicao.notify()
+
+    def cancelar(self):
+        # Descarta o pendente e espera a escrita em andamento (antes de apagar o save)
+        with self.condicao:
+            self.pendente = None
+        with self.escrita:
+            pass
+
+    def _trabalhar(self):
+        while True:
+            with self.condicao:
+                while self.pendente is None and self.rodando:
+                    self.condicao.wait()
+                if self.pendente is None:
+                    return
+                conteudo, self.pendente = self.pendente, None
+                self.escrita.acquire()
+            try:
+                gravar(self.caminho, conteudo)
+            except OSError as erro:
+                if not self.falhou:
+                    self.falhou = True
+                    avisar(f"autosave desligado, não foi possível gravar {self.caminho}: {erro}")
+            finally:
+                self.escrita.release()
+
+    def fechar(self):
+        # Grava o que estiver pendente e encerra a thread
+        with self.condicao:
+            self.rodando = False
+            self.condicao.notify()
+        self.thread.join()
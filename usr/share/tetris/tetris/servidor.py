@@ -0,0 +1,263 @@
+import asyncio
+import collections
+import random
+import struct
+import time
+
+from nucleo import COLS, LINHAS, FORMAS, NADA, QUEDA, GRAVIDADE, Jogo
+
+# --- SERVIDOR DE PARTIDAS VERSUS (ASYNCIO) ---
+# Partidas de dois jogadores com estado autoritativo no servidor: cada jogador
+# tem um Jogo (nucleo.py) e só manda ações; a gravidade e o lixo são do servidor.
+# Os dois jogos de uma partida usam o mesmo seed (mesma sequência de peças).
+# Limpar 2, 3 ou 4 linhas manda 1, 2 ou 4 linhas de lixo para o adversário.
+#
+# A gravidade de todas as partidas roda numa única roda de tempo (RodaTempo),
+# em vez de uma tarefa por jogo. O atraso de cada volta da roda em relação ao
+# horário previsto é guardado para medir o jitter (ESTATISTICAS).
+#
+# As mensagens geradas pela roda (gravidade, lixo) não esperam drain(): um
+# cliente que para de ler e acumula mais de LIMITE_BUFFER bytes no buffer de
+# escrita é desconectado (e perde a partida).
+#
+# Protocolo binário (TCP ou socket unix):
+#   cliente -> servidor: um byte por mensagem
+#     0..6  ação de Jogo.step() (GRAVIDADE é ignorada: quem manda é a roda)
+#     ENTRAR       entra na fila e começa uma partida quando houver adversário
+#     ESTATISTICAS pede as estatísticas do servidor
+#   servidor -> cliente: tipo (1 byte) + campos little-endian
+#     PARTIDA      COLS, LINHAS (uint16)
+#     ESTADO       pontuação, linhas (uint32), nível, próxima forma (byte),
+#                  grid (1 byte/célula) + peça atual no formato de PECA
+#     PECA         x, y (int16), altura, largura + uma máscara de bits por linha
+#     LIXO         linhas recebidas (byte); um ESTADO vem em seguida
+#     FIM          venceu (byte)
+#     ESTATISTICAS partidas em andamento, passos aplicados, voltas da roda e
+#                  atraso médio/p99/máximo da roda em ms
+#
+# python servidor.py [--porta 7777] [--unix CAMINHO]
+
+ENTRAR = 0x10
+ESTATISTICAS = 0x11
+
+PARTIDA, ESTADO, PECA, LIXO, FIM = range(1, 6)
+
+# Parte fixa de cada mensagem do servidor, com o byte do tipo
+CAMPOS = {
+    PARTIDA: struct.Struct("<BHH"),
+    ESTADO: struct.Struct("<BIIBB"),
+    PECA: struct.Struct("<BhhBB"),
+    LIXO: struct.Struct("<BB"),
+    FIM: struct.Struct("<BB"),
+    ESTATISTICAS: struct.Struct("<BIQQddd"),
+}
+
+# Linhas de lixo mandadas por linhas removidas de uma vez
+LIXO_POR_LINHAS = [0, 0, 1, 2, 4]
+
+PORTA = 7777
+
+LIMITE_BUFFER = 256 * 1024
+
+def codificar_peca(peca):
+    forma = peca.forma
+    return (CAMPOS[PECA].pack(PECA, peca.x, peca.y, len(forma), len(forma[0]))
+            + bytes(sum(1 << j for j, bloco in enumerate(linha) if bloco) for linha in forma))
+
+def codificar_estado(jogo):
+    return (CAMPOS[ESTADO].pack(ESTADO, jogo.pontuacao, jogo.linhas_totais, jogo.nivel, FORMAS.index(jogo.proxima.forma))
+            + bytes(valor for linha in jogo.grid for valor in linha)
+            + codificar_peca(jogo.peca))
+
+# --- RODA DE TEMPO ---
+# Hashed timing wheel: POSICOES listas, uma por volta de resolucao_ms. Um evento
+# com atraso maior que uma volta completa fica na posição até a volta certa.
+class RodaTempo:
+    def __init__(self, resolucao_ms=10, posicoes=256, amostras=10000):
+        self.resolucao_ms = resolucao_ms
+        self.posicoes = [[] for _ in range(posicoes)]
+        self.volta = 0
+        self.atrasos = collections.deque(maxlen=amostras)  # ms, por volta
+
+    def agendar(self, atraso_ms, funcao):
+        alvo = self.volta + max(1, round(atraso_ms / self.resolucao_ms))
+        self.posicoes[alvo % len(self.posicoes)].append((alvo, funcao))
+
+    def _avancar(self):
+        self.volta += 1
+        posicao = self.posicoes[self.volta % len(self.posicoes)]
+        vencidos = [funcao for alvo, funcao in posicao if alvo <= self.volta]
+        if vencidos:
+            posicao[:] = [(alvo, funcao) for alvo, funcao in posicao if alvo > self.volta]
+            for funcao in vencidos:
+                funcao()
+
+    async def girar(self):
+        # Atrasada (loop ocupado), a roda recupera as voltas sem dormir, mas
+        # cede o loop a cada volta (sleep(0)) para os sockets continuarem
+        # sendo lidos e drenados mesmo com o servidor sobrecarregado
+        loop = asyncio.get_running_loop()
+        inicio = loop.time()
+        while True:
+            prazo = inicio + (self.volta + 1) * self.resolucao_ms / 1000
+            await asyncio.sleep(max(0.0, prazo - loop.time()))
+            self.atrasos.append((loop.time() - prazo) * 1000)
+            self._avancar()
+
+    def jitter(self):
+        # (média, p99, máximo) do atraso das voltas, em ms
+        if not self.atrasos:
+            return 0.0, 0.0, 0.0
+        ordenados = sorted(self.atrasos)
+        p99 = ordenados[min(len(ordenados) - 1, int(len(ordenados) * 0.99))]
+        return sum(ordenados) / len(ordenados), p99, ordenados[-1]
+
+# --- PARTIDAS ---
+class Jogador:
+    def __init__(self, escritor):
+        self.escritor = escritor
+        self.jogo = None
+        self.partida = None
+
+    def enviar(self, dados):
+        if self.escritor.is_closing():
+            return
+        if self.escritor.transport.get_write_buffer_size() > LIMITE_BUFFER:
+            # Cliente parou de ler: a leitura em _conexao termina e encerra a partida
+            self.escritor.transport.abort()
+            return
+        self.escritor.write(dados)
+
+class Partida:
+    def __init__(self, servidor, jogadores, seed):
+        self.servidor = servidor
+        self.jogadores = jogadores
+        self.rng = random.Random(seed)  # buracos do lixo
+        self.ativa = True
+        for jogador in jogadores:
+            jogador.partida = self
+            jogador.jogo = Jogo(random.Random(seed))
+            jogador.enviar(CAMPOS[PARTIDA].pack(PARTIDA, COLS, LINHAS) + codificar_estado(jogador.jogo))
+            self._agendar_gravidade(jogador)
+
+    def _agendar_gravidade(self, jogador):
+        self.servidor.roda.agendar(jogador.jogo.velocidade_queda(), lambda: self._gravidade(jogador))
+
+    def _gravidade(self, jogador):
+        if not self.ativa:
+            return
+        self.aplicar(jogador, GRAVIDADE)
+        if self.ativa:
+            self._agendar_gravidade(jogador)
+
+    def adversario(self, jogador):
+        return self.jogadores[1] if jogador is self.jogadores[0] else self.jogadores[0]
+
+    def aplicar(self, jogador, acao):
+        jogo = jogador.jogo
+        peca = jogo.peca
+        antes = (peca.x, peca.y, peca.forma)
+        linhas_removidas = jogo.step(acao)
+        self.servidor.passos += 1
+        if jogo.fixada is None:
+            if antes != (peca.x, peca.y, peca.forma):
+                jogador.enviar(codificar_peca(peca))
+            return
+        jogador.enviar(codificar_estado(jogo))
+        if jogo.game_over:
+            self.encerrar(self.adversario(jogador))
+            return
+        lixo = LIXO_POR_LINHAS[min(linhas_removidas, len(LIXO_POR_LINHAS) - 1)]
+        if lixo:
+            outro = self.adversario(jogador)
+            outro.jogo.adicionar_lixo(lixo, self.rng.randrange(COLS))
+            outro.enviar(CAMPOS[LIXO].pack(LIXO, lixo) + codificar_estado(outro.jogo))
+            if outro.jogo.game_over:
+                self.encerrar(jogador)
+
+    def encerrar(self, vencedor):
+        if not self.ativa:
+            return
+        self.ativa = False
+        self.servidor.partidas.discard(self)
+        for jogador in self.jogadores:
+            jogador.enviar(CAMPOS[FIM].pack(FIM, jogador is vencedor))
+            jogador.partida = None
+
+# --- SERVIDOR ---
+class Servidor:
+    def __init__(self, seed=None):
+        self.roda = RodaTempo()
+        self.rng = random.Random(seed)
+        self.esperando = None  # jogador na fila
+        self.partidas = set()
+        self.passos = 0
+
+    def _entrar(self, jogador):
+        if jogador.partida is not None or self.esperando is jogador:
+            return
+        if self.esperando is None or self.esperando.escritor.is_closing():
+            self.esperando = jogador
+            return
+        outro, self.esperando = self.esperando, None
+        self.partidas.add(Partida(self, [outro, jogador], self.rng.getrandbits(64)))
+
+    def _estatisticas(self):
+        media, p99, maximo = self.roda.jitter()
+        return CAMPOS[ESTATISTICAS].pack(ESTATISTICAS, len(self.partidas), self.passos, self.roda.volta, media, p99, maximo)
+
+    def _mensagem(self, jogador, byte):
+        if byte <= QUEDA:
+            if byte not in (NADA, GRAVIDADE) and jogador.partida is not None:
+                jogador.partida.aplicar(jogador, byte)
+        elif byte == ENTRAR:
+            self._entrar(jogador)
+        elif byte == ESTATISTICAS:
+            jogador.enviar(self._estatisticas())
+
+    async def _conexao(self, leitor, escritor):
+        jogador = Jogador(escritor)
+        try:
+            while True:
+                dados = await leitor.read(4096)
+                if not dados:
+                    break
+                for byte in dados:
+                    self._mensagem(jogador, byte)
+                await escritor.drain()
+        except ConnectionError:
+            pass
+        finally:
+            # Desconectar entrega a partida ao adversário
+            if self.esperando is jogador:
+                self.esperando = None
+            if jogador.partida is not None:
+                jogador.partida.encerrar(jogador.partida.adversario(jogador))
+            escritor.close()
+
+    async def servir(self, porta=PORTA, unix=None, pronto=None):
+        # pronto: asyncio.Event sinalizado quando o socket já aceita conexões
+        if unix:
+            servidor = await asyncio.start_unix_server(self._conexao, unix)
+        else:
+            servidor = await asyncio.start_server(self._conexao, "127.0.0.1", porta)
+        roda = asyncio.create_task(self.roda.girar())
+        if pronto is not None:
+            pronto.set()
+        try:
+            async with servidor:
+                await servidor.serve_forever()
+        finally:
+            roda.cancel()
+
+if __name__ == "__main__":
+    import argparse
+    parser = argparse.ArgumentParser(description="Servidor de partidas versus")
+    parser.add_argument("--porta", type=int, default=PORTA)
+    parser.add_argument("--unix", metavar="CAMINHO", help="socket unix em vez de TCP")
+    a = parser.parse_args()
+    print(f"servindo em {a.unix or f'127.0.0.1:{a.porta}'} ({time.strftime('%H:%M:%S')})")
+    try:
+        asyncio.run(Servidor().servir(a.porta, a.unix))
+    except KeyboardInterrupt:
+        pass